@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for the solver kernels
+Instances from in/ are grouped by K bucket and wall count W; every kernel is
+timed on each group and reported as ops/sec (mean and stdev over repeats).
+Results can be saved as a JSON baseline and later compared against it.
+
+Usage: python3 bench.py [--in=in] [--backend=python] [--per-bucket=2]
+           [--repeats=5] [--kernels=tactic,rng,...] [--save=baseline.json]
+           [--compare=baseline.json] [--threshold=0.10]
+"""
+
+import json
+import os
+import statistics
+import sys
+import time
+
+import pycho
+from param_table import bucket_key
+from phase_cache import PhaseCacheEvaluator
+
+N = pycho.N
+
+# Target wall time of one timed repeat
+REPEAT_SECONDS = 0.05
+
+
+def load_buckets(in_dir, per_bucket, backend):
+    """{bucket name: [prepared MazeOptimizer]} with at most per_bucket instances each"""
+    buckets = {}
+    for name in sorted(os.listdir(in_dir)):
+        if not (name.endswith(".txt") and name[:-4].isdigit()):
+            continue
+        opt = pycho.MazeOptimizer(backend=backend)
+        with open(os.path.join(in_dir, name), "rb") as f:
+            opt.read_input(f)
+        opt.prepare()
+        key = bucket_key(opt.K, opt.W)
+        group = buckets.setdefault(key, [])
+        if len(group) < per_bucket:
+            opt.rebuild_all()
+            group.append(opt)
+    return dict(sorted(buckets.items()))
+
+
+def bench_tactic(opt):
+    return lambda: opt.run_tactic(opt.tactic)
+
+
+def bench_rebuild_row(opt):
+    rows = iter(range(1 << 62))
+    return lambda: opt.rebuild_next_wall_row(next(rows) % N)
+
+
+def bench_rebuild_col(opt):
+    cols = iter(range(1 << 62))
+    return lambda: opt.rebuild_next_wall_col(next(cols) % N)
+
+
+def bench_rng(opt):
+    return pycho.rng.rand
+
+
+def bench_state(opt):
+    opt.reset()
+
+    def op():
+        opt.state_save()
+        opt.state_load()
+    return op
+
+
+def bench_sa_step(opt):
+    """One SA step (flip, evaluate, greedy accept or revert) on the phase-cached path"""
+    evaluator = PhaseCacheEvaluator(opt, opt.tactic)
+    state = [evaluator.av]
+
+    def op():
+        type_op, r, c = opt.draw_flips(1)[0]
+        opt.toggle_wall(type_op, r, c)
+        av = evaluator.evaluate(type_op, r, c)
+        if av <= state[0]:
+            evaluator.commit()
+            state[0] = av
+        else:
+            opt.toggle_wall(type_op, r, c)
+            evaluator.discard()
+    return op
+
+
+KERNELS = {
+    "tactic": bench_tactic,
+    "rebuild_row": bench_rebuild_row,
+    "rebuild_col": bench_rebuild_col,
+    "rng": bench_rng,
+    "state": bench_state,
+    "sa_step": bench_sa_step,
+}
+
+
+def measure(ops, repeats):
+    """ops/sec per repeat; ops are called round-robin, calibrated to REPEAT_SECONDS"""
+    count = 1
+    while True:
+        t = time.perf_counter()
+        for _ in range(count):
+            for op in ops:
+                op()
+        elapsed = time.perf_counter() - t
+        if elapsed >= REPEAT_SECONDS / 4:
+            break
+        count *= 2
+    count = max(1, int(count * REPEAT_SECONDS / elapsed))
+    rates = []
+    for _ in range(repeats):
+        t = time.perf_counter()
+        for _ in range(count):
+            for op in ops:
+                op()
+        rates.append(count * len(ops) / (time.perf_counter() - t))
+    return rates
+
+
+def run(buckets, kernels, repeats):
+    """{kernel: {bucket: {"mean", "stdev"}}} in ops/sec"""
+    results = {}
+    for kernel in kernels:
+        results[kernel] = {}
+        for key, opts in buckets.items():
+            pycho.rng.init(1)
+            rates = measure([KERNELS[kernel](opt) for opt in opts], repeats)
+            results[kernel][key] = {
+                "mean": statistics.mean(rates),
+                "stdev": statistics.stdev(rates) if len(rates) > 1 else 0.0,
+            }
+            # Kernels such as sa_step change the walls; start the next one clean
+            for opt in opts:
+                opt.wallv.load(opt.owallv)
+                opt.wallh.load(opt.owallh)
+                opt.rebuild_all()
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Lines describing each kernel/bucket against baseline; returns (lines, regressions)"""
+    lines = []
+    regressions = 0
+    for kernel, by_bucket in results.items():
+        for key, cur in by_bucket.items():
+            base = baseline.get(kernel, {}).get(key)
+            if base is None:
+                lines.append(f"{kernel:12s} {key:12s} {cur['mean']:12.1f}   (no baseline)")
+                continue
+            ratio = cur["mean"] / base["mean"]
+            # A slowdown only counts if it also exceeds the combined noise
+            noise = 2 * (cur["stdev"] + base["stdev"]) / base["mean"]
+            flag = ""
+            if ratio < 1 - max(threshold, noise):
+                flag = "  REGRESSION"
+                regressions += 1
+            lines.append(f"{kernel:12s} {key:12s} {cur['mean']:12.1f} {base['mean']:12.1f} {ratio:7.3f}{flag}")
+    return lines, regressions
+
+
+def main():
+    in_dir = "in"
+    backend = pycho.BACKEND
+    per_bucket = 2
+    repeats = 5
+    kernels = list(KERNELS)
+    save = None
+    baseline_path = None
+    threshold = 0.10
+    for arg in sys.argv[1:]:
+        key, _, value = arg.partition("=")
+        if key == "--in":
+            in_dir = value
+        elif key == "--backend":
+            backend = value
+        elif key == "--per-bucket":
+            per_bucket = int(value)
+        elif key == "--repeats":
+            repeats = int(value)
+        elif key == "--kernels":
+            kernels = value.split(",")
+        elif key == "--save":
+            save = value
+        elif key == "--compare":
+            baseline_path = value
+        elif key == "--threshold":
+            threshold = float(value)
+    for kernel in kernels:
+        if kernel not in KERNELS:
+            raise ValueError(f"unknown kernel {kernel!r}, expected one of {', '.join(KERNELS)}")
+
+    buckets = load_buckets(in_dir, per_bucket, backend)
+    results = run(buckets, kernels, repeats)
+    report = {"backend": backend, "repeats": repeats, "results": results}
+
+    if baseline_path:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+        print(f"{'kernel':12s} {'bucket':12s} {'ops/sec':>12s} {'baseline':>12s} {'ratio':>7s}")
+        lines, regressions = compare(results, baseline["results"], threshold)
+        print("\n".join(lines))
+        print(f"regressions = {regressions}")
+    else:
+        regressions = 0
+        print(f"{'kernel':12s} {'bucket':12s} {'ops/sec':>12s} {'stdev':>10s}")
+        for kernel, by_bucket in results.items():
+            for key, r in by_bucket.items():
+                print(f"{kernel:12s} {key:12s} {r['mean']:12.1f} {r['stdev']:10.1f}")
+
+    if save:
+        with open(save, "w") as f:
+            json.dump(report, f, indent=1)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Bitboard grids for walls, marks and occupancy
+Each row (or column, when transposed) is stored as a single Python int
+"""
+
+
+def highest_bit_at_most(word, i):
+    """Index of the highest set bit <= i, or -1 if there is none"""
+    return (word & ((2 << i) - 1)).bit_length() - 1
+
+
+def lowest_bit_at_least(word, i):
+    """Index of the lowest set bit >= i, or -1 if there is none"""
+    word >>= i
+    if not word:
+        return -1
+    return i + (word & -word).bit_length() - 1
+
+
+class BitBoard:
+    """rows x cols grid of bits addressed as (r, c)
+
+    With transposed=False words[r] holds row r (bit c = cell (r, c)); with
+    transposed=True words[c] holds column c (bit r = cell (r, c)). Pick the
+    orientation that makes the hot "next set bit along a lane" query a single
+    word operation.
+    """
+    __slots__ = ("rows", "cols", "transposed", "words")
+
+    def __init__(self, rows, cols, transposed=False):
+        self.rows = rows
+        self.cols = cols
+        self.transposed = transposed
+        self.words = [0] * (cols if transposed else rows)
+
+    def get(self, r, c):
+        if self.transposed:
+            return (self.words[c] >> r) & 1
+        return (self.words[r] >> c) & 1
+
+    def set(self, r, c):
+        if self.transposed:
+            self.words[c] |= 1 << r
+        else:
+            self.words[r] |= 1 << c
+
+    def clear(self, r, c):
+        if self.transposed:
+            self.words[c] &= ~(1 << r)
+        else:
+            self.words[r] &= ~(1 << c)
+
+    def toggle(self, r, c):
+        """Flip (r, c) and return its new value"""
+        if self.transposed:
+            self.words[c] ^= 1 << r
+            return (self.words[c] >> r) & 1
+        self.words[r] ^= 1 << c
+        return (self.words[r] >> c) & 1
+
+    def clear_all(self):
+        self.words = [0] * len(self.words)
+
+    def load(self, other):
+        """Overwrite this board with the contents of another of the same shape"""
+        self.words[:] = other.words
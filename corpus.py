@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Binary instance corpus: a directory of text instances packed into one file
+Layout: a fixed header, a uint32 seed index and fixed-size records (K, src,
+dst as uint8 pairs, walls as one bit-packed uint32 per row). Corpus
+memory-maps the file, so opening is instant and records are zero-copy views.
+
+Usage: python3 corpus.py pack <in_dir> <corpus.bin>
+       python3 corpus.py show <corpus.bin> [seed]
+"""
+
+import os
+import sys
+
+import numpy as np
+
+from instance_io import parse_instance
+
+N = 30
+MAXK = 100
+
+MAGIC = b"AWTFCORP"
+VERSION = 1
+
+HEADER_DTYPE = np.dtype([
+    ("magic", "S8"),
+    ("version", "<u4"),
+    ("count", "<u4"),
+    ("n", "<u4"),
+    ("maxk", "<u4"),
+    ("record_size", "<u4"),
+    ("records_offset", "<u4"),
+])
+
+# wall_v[i] bit j: wall between (i, j) and (i, j+1); wall_h[i] bit j: wall between (i, j) and (i+1, j)
+RECORD_DTYPE = np.dtype([
+    ("K", "<u2"),
+    ("src", "u1", (MAXK, 2)),
+    ("dst", "u1", (MAXK, 2)),
+    ("wall_v", "<u4", (N,)),
+    ("wall_h", "<u4", (N - 1,)),
+])
+
+
+def pack(in_dir, path):
+    """Pack every <seed>.txt in in_dir (seed numeric) into a corpus file; returns the count"""
+    names = sorted(name for name in os.listdir(in_dir)
+                   if name.endswith(".txt") and name[:-4].isdigit())
+    records = np.zeros(len(names), dtype=RECORD_DTYPE)
+    seeds = np.zeros(len(names), dtype="<u4")
+    for k, name in enumerate(names):
+        with open(os.path.join(in_dir, name), "rb") as f:
+            inst = parse_instance(f.read())
+        if inst.N != N or inst.K > MAXK:
+            raise ValueError(f"{name}: unsupported N={inst.N}, K={inst.K}")
+        rec = records[k]
+        rec["K"] = inst.K
+        rec["src"][:inst.K] = inst.src
+        rec["dst"][:inst.K] = inst.dst
+        # Drop the boundary bits of the padded wall words
+        rec["wall_v"] = [(w >> 1) & ((1 << (N - 1)) - 1) for w in inst.wall_v]
+        rec["wall_h"] = inst.wall_h[1:N]
+        seeds[k] = int(name[:-4])
+
+    # Records start on an 8-byte boundary after the header and seed index
+    records_offset = HEADER_DTYPE.itemsize + seeds.nbytes
+    records_offset = (records_offset + 7) & ~7
+    header = np.zeros(1, dtype=HEADER_DTYPE)
+    header[0] = (MAGIC, VERSION, len(names), N, MAXK, RECORD_DTYPE.itemsize, records_offset)
+    with open(path, "wb") as f:
+        f.write(header.tobytes())
+        f.write(seeds.tobytes())
+        f.write(b"\0" * (records_offset - HEADER_DTYPE.itemsize - seeds.nbytes))
+        f.write(records.tobytes())
+    return len(names)
+
+
+class Corpus:
+    """Read-only memory-mapped view of a packed corpus"""
+    def __init__(self, path):
+        self.data = np.memmap(path, dtype=np.uint8, mode="r")
+        header = self.data[:HEADER_DTYPE.itemsize].view(HEADER_DTYPE)[0]
+        if header["magic"] != MAGIC or header["version"] != VERSION:
+            raise ValueError(f"{path}: not a version {VERSION} corpus file")
+        if header["n"] != N or header["maxk"] != MAXK or header["record_size"] != RECORD_DTYPE.itemsize:
+            raise ValueError(f"{path}: corpus layout does not match this build")
+        count = int(header["count"])
+        offset = HEADER_DTYPE.itemsize
+        self.seeds = self.data[offset:offset + 4 * count].view("<u4")
+        offset = int(header["records_offset"])
+        self.records = self.data[offset:offset + RECORD_DTYPE.itemsize * count].view(RECORD_DTYPE)
+        self.index = {int(seed): k for k, seed in enumerate(self.seeds)}
+
+    def __len__(self):
+        return len(self.records)
+
+    def record(self, seed):
+        """Zero-copy record of seed"""
+        return self.records[self.index[seed]]
+
+    def views(self, seed):
+        """(K, src, dst, wall_v, wall_h) as zero-copy arrays; src/dst are K x 2 uint8"""
+        rec = self.record(seed)
+        K = int(rec["K"])
+        return K, rec["src"][:K], rec["dst"][:K], rec["wall_v"], rec["wall_h"]
+
+    def text(self, seed):
+        """seed in the original text format, for solvers reading stdin"""
+        K, src, dst, wall_v, wall_h = self.views(seed)
+        lines = [f"{N} {K}"]
+        lines += [f"{a} {b} {c} {d}" for (a, b), (c, d) in zip(src.tolist(), dst.tolist())]
+        lines += ["".join("1" if (int(w) >> j) & 1 else "0" for j in range(N - 1)) for w in wall_v]
+        lines += ["".join("1" if (int(w) >> j) & 1 else "0" for j in range(N)) for w in wall_h]
+        return "\n".join(lines) + "\n"
+
+
+def main():
+    if len(sys.argv) == 4 and sys.argv[1] == "pack":
+        count = pack(sys.argv[2], sys.argv[3])
+        print(f"packed {count} instances into {sys.argv[3]}")
+    elif len(sys.argv) in (3, 4) and sys.argv[1] == "show":
+        corpus = Corpus(sys.argv[2])
+        if len(sys.argv) == 4:
+            print(corpus.text(int(sys.argv[3])), end="")
+        else:
+            print(f"{len(corpus)} instances, seeds {corpus.seeds.min()}-{corpus.seeds.max()}")
+    else:
+        print(__doc__.split("Usage: ")[1], file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Reverse-BFS distance fields for individual robot routing
+Destinations are fixed, so pycho caches a field per destination and wall
+layout; its cleanup rounds route a robot again on an unchanged layout, and
+paths become a greedy descent instead of a fresh search
+"""
+
+from collections import OrderedDict
+
+N = 30
+
+UNREACHABLE = -1
+
+
+def grid_adjacency(wall_v, wall_h):
+    """Flat neighbour lists [(cell id, move)] from input-format walls.
+
+    wall_v[i][j] blocks (i, j)-(i, j+1) and wall_h[i][j] blocks (i, j)-(i+1, j);
+    entries may be ints, bools or '0'/'1' characters.
+    """
+    adj = []
+    for r in range(N):
+        for c in range(N):
+            nb = []
+            if r > 0 and wall_h[r-1][c] in (0, False, '0'):
+                nb.append(((r-1)*N + c, 'U'))
+            if r < N-1 and wall_h[r][c] in (0, False, '0'):
+                nb.append(((r+1)*N + c, 'D'))
+            if c > 0 and wall_v[r][c-1] in (0, False, '0'):
+                nb.append((r*N + c-1, 'L'))
+            if c < N-1 and wall_v[r][c] in (0, False, '0'):
+                nb.append((r*N + c+1, 'R'))
+            adj.append(nb)
+    return adj
+
+
+def distance_field(adj, target, blocked=frozenset()):
+    """Distances from every cell to target (flat id), avoiding blocked cells"""
+    field = [UNREACHABLE] * (N*N)
+    if target not in blocked:
+        field[target] = 0
+        queue = [target]
+        for v in queue:
+            d = field[v] + 1
+            for nid, _ in adj[v]:
+                if field[nid] == UNREACHABLE and nid not in blocked:
+                    field[nid] = d
+                    queue.append(nid)
+    return field
+
+
+class DistanceFieldCache:
+    """LRU cache of static distance-to-target fields keyed by (layout, target)
+
+    The layout key is any hashable summary of the walls the adjacency was
+    built from; callers pass a new key (and adjacency) whenever walls change.
+    """
+    def __init__(self, capacity=512):
+        self.capacity = capacity
+        self.fields = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def field(self, layout, adj, target):
+        """Distances from every cell to target (flat id) on layout"""
+        key = (layout, target)
+        field = self.fields.get(key)
+        if field is not None:
+            self.hits += 1
+            self.fields.move_to_end(key)
+            return field
+
+        self.misses += 1
+        field = distance_field(adj, target)
+        self.fields[key] = field
+        if len(self.fields) > self.capacity:
+            self.fields.popitem(last=False)
+        return field
+
+
+def descend(adj, field, start, occupied=()):
+    """Greedy shortest path down a distance field, or None if robots block every way down"""
+    v = start
+    d = field[v]
+    if d == UNREACHABLE:
+        return None
+    path = []
+    while d > 0:
+        for nid, ch in adj[v]:
+            if field[nid] == d - 1 and nid not in occupied:
+                path.append(ch)
+                v = nid
+                d -= 1
+                break
+        else:
+            return None
+    return "".join(path)
+
+
+def route(cache, layout, adj, start, target, occupied):
+    """Path from start to target (flat ids) avoiding occupied cells, or None if unreachable.
+
+    Tries the cached static field first and falls back to a field that
+    treats the other robots as obstacles; start itself is never considered
+    blocked. Occupancy rarely repeats, so the fallback field is not cached.
+    """
+    path = descend(adj, cache.field(layout, adj, target), start, occupied)
+    if path is not None:
+        return path
+    blocked = frozenset(occupied) - {start}
+    return descend(adj, distance_field(adj, target, blocked), start)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Robot grouping for multi-group plans
+Robots are clustered by displacement vector (src -> dst) and every group
+gets its own 7-phase tactic; the per-group phases are interleaved so each
+group command moves one cluster while the others act as blockers.
+"""
+
+from phase_cache import split_tactic
+
+# Lloyd iterations for the displacement clustering
+KMEANS_ITERS = 10
+
+
+def cluster_displacements(src, dst, count):
+    """Group id per robot, clustering displacement vectors into at most count groups.
+
+    Farthest-point seeding and Lloyd iterations on (dy, dx), both
+    deterministic; empty clusters are dropped and ids renumbered from 0.
+    """
+    vecs = [(d[0] - s[0], d[1] - s[1]) for s, d in zip(src, dst)]
+    centers = [max(vecs, key=lambda v: abs(v[0]) + abs(v[1]))]
+    while len(centers) < min(count, len(vecs)):
+        far = max(vecs, key=lambda v: min((v[0] - c[0]) ** 2 + (v[1] - c[1]) ** 2 for c in centers))
+        if far in centers:
+            break
+        centers.append(far)
+
+    group = [0] * len(vecs)
+    for _ in range(KMEANS_ITERS):
+        group = [min(range(len(centers)), key=lambda k: (v[0] - centers[k][0]) ** 2 + (v[1] - centers[k][1]) ** 2)
+                 for v in vecs]
+        sums = [[0, 0, 0] for _ in centers]
+        for g, v in zip(group, vecs):
+            sums[g][0] += v[0]
+            sums[g][1] += v[1]
+            sums[g][2] += 1
+        centers = [(sy / n, sx / n) if n else c for (sy, sx, n), c in zip(sums, centers)]
+
+    ids = {}
+    return [ids.setdefault(g, len(ids)) for g in group]
+
+
+def group_counts(src, dst, group, g, change):
+    """Per-direction move counts for group g, computed like MazeOptimizer.prepare"""
+    maxu = maxd = maxl = maxr = 0
+    for s, d, gi in zip(src, dst, group):
+        if gi == g:
+            maxu = max(maxu, d[0] - s[0])
+            maxd = max(maxd, s[0] - d[0])
+            maxl = max(maxl, d[1] - s[1])
+            maxr = max(maxr, s[1] - d[1])
+    return {"U": maxu + change, "L": maxl + change, "D": maxd + change, "R": maxr + change}
+
+
+def grouped_plan(src, dst, group, change, order="ULDR", split=0.5):
+    """Interleaved (direction, count, group) plan: phase p of every group, then phase p+1"""
+    tactics = [split_tactic(order, group_counts(src, dst, group, g, change), split)
+               for g in range(max(group) + 1)]
+    plan = []
+    for p in range(len(tactics[0])):
+        for g, tactic in enumerate(tactics):
+            d, n = tactic[p]
+            if n > 0:
+                plan.append((d, n, g))
+    return plan
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Shared instance parser for the solvers and tools
+stdin is read once as bytes and split in one pass; each wall row becomes a
+bit word with a single int(row, 2) call, with the grid boundary already set.
+"""
+
+import sys
+
+N = 30
+
+
+class Instance:
+    """One parsed instance
+
+    src/dst are lists of (row, col). v_rows/h_rows are the raw '0'/'1' rows
+    as bytes (N rows of N-1, N-1 rows of N). wall_v[r] bit c is the wall on
+    the left of cell (r, c), for c in 0..N, and wall_h[r] bit c the wall
+    above cell (r, c), for r in 0..N; the boundary bits are set.
+    """
+    __slots__ = ("N", "K", "src", "dst", "v_rows", "h_rows", "wall_v", "wall_h")
+
+    def __init__(self, N, K, src, dst, v_rows, h_rows):
+        self.N = N
+        self.K = K
+        self.src = src
+        self.dst = dst
+        self.v_rows = v_rows
+        self.h_rows = h_rows
+        edge = (1 << N) | 1
+        # Row strings list bit 0 first, int() wants it last
+        self.wall_v = [int(row[::-1], 2) << 1 | edge for row in v_rows]
+        full = (1 << N) - 1
+        self.wall_h = [full] + [int(row[::-1], 2) for row in h_rows] + [full]
+
+    def wall_lists(self):
+        """Unpadded (wall_v, wall_h) as lists of bool rows, as the tools' Input holds them"""
+        return ([[ch == 49 for ch in row] for row in self.v_rows],
+                [[ch == 49 for ch in row] for row in self.h_rows])
+
+    def wall_strings(self):
+        """Unpadded wall rows as str, exactly as they appear in the input"""
+        return ([row.decode() for row in self.v_rows], [row.decode() for row in self.h_rows])
+
+
+def parse_instance(data):
+    """Instance from the full input text (bytes or str)"""
+    if isinstance(data, str):
+        data = data.encode()
+    tokens = data.split()
+    N = int(tokens[0])
+    K = int(tokens[1])
+    nums = list(map(int, tokens[2:2 + 4*K]))
+    src = list(zip(nums[0::4], nums[1::4]))
+    dst = list(zip(nums[2::4], nums[3::4]))
+    p = 2 + 4*K
+    return Instance(N, K, src, dst, tokens[p:p + N], tokens[p + N:p + 2*N - 1])
+
+
+def read_instance(stream=None):
+    """Instance from stdin (or any text or binary stream)"""
+    if stream is None:
+        stream = getattr(sys.stdin, "buffer", sys.stdin)
+    return parse_instance(stream.read())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Opt-in instrumentation for the solvers
+Set PYCHO_PROFILE=1 (report to stderr) or PYCHO_PROFILE=<path> (report to a
+file) to enable it. Only then are the selected methods replaced by timing
+wrappers, so a disabled run executes the original, unwrapped code; phase()
+becomes a shared no-op context manager and count() is meant for once-per-run
+totals, not for hot loops.
+"""
+
+import atexit
+import contextlib
+import functools
+import json
+import os
+import sys
+import time
+
+TARGET = os.environ.get("PYCHO_PROFILE", "")
+ENABLED = TARGET not in ("", "0")
+
+_start = time.perf_counter()
+_calls = {}
+_counters = {}
+_phases = {}
+_null = contextlib.nullcontext()
+
+
+def _timed(name, fn):
+    stat = _calls.setdefault(name, [0, 0.0])
+    perf_counter = time.perf_counter
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        t = perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            stat[0] += 1
+            stat[1] += perf_counter() - t
+    return wrapper
+
+
+def wrap(owner, names, prefix=None):
+    """Time every call of owner.<name> (class methods or module functions) if enabled"""
+    if not ENABLED:
+        return
+    prefix = prefix or getattr(owner, "__name__", str(owner))
+    for name in names:
+        setattr(owner, name, _timed(f"{prefix}.{name}", getattr(owner, name)))
+
+
+@contextlib.contextmanager
+def _phase(name):
+    t = time.perf_counter()
+    try:
+        yield
+    finally:
+        _phases[name] = _phases.get(name, 0.0) + time.perf_counter() - t
+
+
+def phase(name):
+    """Context manager adding its wall time to phase name"""
+    if not ENABLED:
+        return _null
+    return _phase(name)
+
+
+def count(name, n=1):
+    if ENABLED:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def report():
+    """The collected statistics as a JSON-serializable dict; call times are inclusive"""
+    calls = {}
+    for name, (n, total) in sorted(_calls.items(), key=lambda kv: -kv[1][1]):
+        if n:
+            calls[name] = {"calls": n, "seconds": round(total, 6), "us_per_call": round(1e6 * total / n, 3)}
+    return {
+        "total_seconds": round(time.perf_counter() - _start, 6),
+        "phases": {name: round(total, 6) for name, total in _phases.items()},
+        "counters": dict(_counters),
+        "calls": calls,
+    }
+
+
+def _write_report():
+    text = json.dumps(report(), indent=1)
+    if TARGET == "1":
+        print(text, file=sys.stderr)
+    else:
+        with open(TARGET, "w") as f:
+            f.write(text + "\n")
+
+
+if ENABLED:
+    atexit.register(_write_report)
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+NumPy sweep kernels for the maze optimizer
+Array-backed counterparts of MazeOptimizer.fmove*_xfast
+"""
+
+import numpy as np
+
+N = 30
+
+# Lane offset used to keep grouped cumulative maxima from leaking between lanes
+LANE_STRIDE = 256
+
+
+def grouped_sweep(lane, a):
+    """Solve new[i] = max(a[i], new[i-1] + 1) independently inside each lane.
+
+    `lane` and `a` must already be sorted by lane and then by processing order.
+    Subtracting the rank inside the lane turns the recurrence into a plain
+    running maximum, which is offset per lane so lanes never interact.
+    """
+    k = len(lane)
+    idx = np.arange(k)
+    start = np.ones(k, dtype=bool)
+    start[1:] = lane[1:] != lane[:-1]
+    rank = idx - np.maximum.accumulate(np.where(start, idx, 0))
+    offset = lane * LANE_STRIDE
+    return np.maximum.accumulate(a - rank + offset) - offset + rank
+
+
+def unpack_words(words):
+    """Expand bitboard words into a (len(words), N+2) int8 array of bits"""
+    w = np.array(words, dtype=np.uint64)
+    return ((w[:, None] >> np.arange(N+2, dtype=np.uint64)) & 1).astype(np.int8)
+
+
+class NumpySweeper:
+    """Array-backed sweep engine mirroring the xfast kernels bit for bit"""
+    def __init__(self, opt):
+        self.opt = opt
+        self.K = opt.K
+        self.src_y = np.array([p[0] for p in opt.src[:opt.K]], dtype=np.int16)
+        self.src_x = np.array([p[1] for p in opt.src[:opt.K]], dtype=np.int16)
+        self.dst_y = np.array([p[0] for p in opt.dst[:opt.K]], dtype=np.int16)
+        self.dst_x = np.array([p[1] for p in opt.dst[:opt.K]], dtype=np.int16)
+        self.ys = self.src_y.copy()
+        self.xs = self.src_x.copy()
+
+        self.next_wallu = np.array(opt.next_wallu, dtype=np.int16)
+        self.next_walld = np.array(opt.next_walld, dtype=np.int16)
+        self.next_walll = np.array(opt.next_walll, dtype=np.int16)
+        self.next_wallr = np.array(opt.next_wallr, dtype=np.int16)
+
+    def sync_row(self, r):
+        """Copy row r of the optimizer's next_walll/next_wallr tables"""
+        self.next_walll[r] = self.opt.next_walll[r]
+        self.next_wallr[r] = self.opt.next_wallr[r]
+
+    def sync_col(self, c):
+        """Copy column c of the optimizer's next_wallu/next_walld tables"""
+        self.next_wallu[:, c] = [row[c] for row in self.opt.next_wallu]
+        self.next_walld[:, c] = [row[c] for row in self.opt.next_walld]
+
+    def fast_reset(self):
+        """Reset positions to source"""
+        self.ys[:] = self.src_y
+        self.xs[:] = self.src_x
+
+    def fmoveu_xfast(self, n):
+        """Fast move up"""
+        ys, xs = self.ys, self.xs
+        order = np.argsort(xs.astype(np.int32) * N + ys)
+        y = ys[order].astype(np.int32)
+        x = xs[order].astype(np.int32)
+        a = np.maximum(y - n, self.next_wallu[y, x])
+        ys[order] = grouped_sweep(x, a)
+
+    def fmoved_xfast(self, n):
+        """Fast move down"""
+        ys, xs = self.ys, self.xs
+        order = np.argsort(xs.astype(np.int32) * N - ys)
+        y = ys[order].astype(np.int32)
+        x = xs[order].astype(np.int32)
+        a = -np.minimum(y + n, self.next_walld[y, x])
+        ys[order] = -grouped_sweep(x, a)
+
+    def fmovel_xfast(self, n):
+        """Fast move left"""
+        ys, xs = self.ys, self.xs
+        order = np.argsort(ys.astype(np.int32) * N + xs)
+        y = ys[order].astype(np.int32)
+        x = xs[order].astype(np.int32)
+        a = np.maximum(x - n, self.next_walll[y, x])
+        xs[order] = grouped_sweep(y, a)
+
+    def fmover_xfast(self, n):
+        """Fast move right"""
+        ys, xs = self.ys, self.xs
+        order = np.argsort(ys.astype(np.int32) * N - xs)
+        y = ys[order].astype(np.int32)
+        x = xs[order].astype(np.int32)
+        a = -np.minimum(x + n, self.next_wallr[y, x])
+        xs[order] = -grouped_sweep(y, a)
+
+    def score(self):
+        """Sum of Manhattan distances to the destinations"""
+        return int(np.abs(self.ys - self.dst_y).sum() + np.abs(self.xs - self.dst_x).sum())
+
+    def positions(self):
+        """Current positions as a list of (row, col) tuples"""
+        return list(zip(self.ys.tolist(), self.xs.tolist()))
+
+    def _batch_tables(self, flips):
+        """Build (M, N, N) next-wall tables with one wall flip applied per candidate"""
+        m = len(flips)
+        tu = np.repeat(self.next_wallu[None], m, axis=0)
+        td = np.repeat(self.next_walld[None], m, axis=0)
+        tl = np.repeat(self.next_walll[None], m, axis=0)
+        tr = np.repeat(self.next_wallr[None], m, axis=0)
+
+        kinds = np.array([f[0] for f in flips], dtype=np.int32)
+        rs = np.array([f[1] for f in flips], dtype=np.int32)
+        cs = np.array([f[2] for f in flips], dtype=np.int32)
+        span = np.arange(N, dtype=np.int16)
+
+        iv = np.flatnonzero(kinds == 0)
+        if len(iv):
+            rows = unpack_words(self.opt.wallv.words)[rs[iv]]
+            rows[np.arange(len(iv)), cs[iv] + 1] ^= 1
+            tl[iv, rs[iv]] = np.maximum.accumulate(np.where(rows[:, :N] != 0, span, -1), axis=1)
+            tr[iv, rs[iv]] = np.minimum.accumulate(np.where(rows[:, 1:N+1] != 0, span, N)[:, ::-1], axis=1)[:, ::-1]
+
+        ih = np.flatnonzero(kinds == 1)
+        if len(ih):
+            cols = unpack_words(self.opt.wallh.words)[cs[ih]]
+            cols[np.arange(len(ih)), rs[ih] + 1] ^= 1
+            tu[ih, :, cs[ih]] = np.maximum.accumulate(np.where(cols[:, :N] != 0, span, -1), axis=1)
+            td[ih, :, cs[ih]] = np.minimum.accumulate(np.where(cols[:, 1:N+1] != 0, span, N)[:, ::-1], axis=1)[:, ::-1]
+
+        return tu, td, tl, tr
+
+    def run_tactic_batch(self, flips, tactic):
+        """Score a tactic (list of (direction, count)) for M candidate wall flips at once.
+
+        Each flip is (type_op, r, c) as drawn in the SA loop: type 0 toggles
+        wallv[r][c+1], type 1 toggles wallh[r+1][c]. The optimizer's walls are
+        left untouched; returns an int array of M distance sums.
+        """
+        m = len(flips)
+        tu, td, tl, tr = self._batch_tables(flips)
+        bid = np.repeat(np.arange(m, dtype=np.int32), self.K)
+        ys = np.tile(self.src_y.astype(np.int32), m)
+        xs = np.tile(self.src_x.astype(np.int32), m)
+
+        def move_vertical(table, n, sign):
+            lane = bid * N + xs
+            order = np.argsort(lane * N + sign * ys)
+            y = ys[order]
+            x = xs[order]
+            b = bid[order]
+            if sign > 0:
+                a = np.maximum(y - n, table[b, y, x])
+                ys[order] = grouped_sweep(lane[order], a)
+            else:
+                a = -np.minimum(y + n, table[b, y, x])
+                ys[order] = -grouped_sweep(lane[order], a)
+
+        def move_horizontal(table, n, sign):
+            lane = bid * N + ys
+            order = np.argsort(lane * N + sign * xs)
+            y = ys[order]
+            x = xs[order]
+            b = bid[order]
+            if sign > 0:
+                a = np.maximum(x - n, table[b, y, x])
+                xs[order] = grouped_sweep(lane[order], a)
+            else:
+                a = -np.minimum(x + n, table[b, y, x])
+                xs[order] = -grouped_sweep(lane[order], a)
+
+        for d, n in tactic:
+            if d == "U":
+                move_vertical(tu, n, 1)
+            elif d == "D":
+                move_vertical(td, n, -1)
+            elif d == "L":
+                move_horizontal(tl, n, 1)
+            else:
+                move_horizontal(tr, n, -1)
+
+        dist = np.abs(ys - np.tile(self.dst_y, m)) + np.abs(xs - np.tile(self.dst_x, m))
+        return dist.reshape(m, self.K).sum(axis=1)
+
+
+MT_MATRIX = 2567483615
+
+
+def mt_twist(mt):
+    """Regenerate a uint32[624] Mersenne Twister state in place.
+
+    The sequential recurrence only reads words that are already final or
+    still untouched, so it splits into three independent slices plus the
+    wrap-around word.
+    """
+    for lo, hi, src in ((0, 227, 397), (227, 454, -227), (454, 623, -227)):
+        y = (mt[lo:hi] & 0x80000000) | (mt[lo+1:hi+1] & 0x7FFFFFFF)
+        mt[lo:hi] = mt[lo+src:hi+src] ^ (y >> 1) ^ ((y & 1) * np.uint32(MT_MATRIX))
+    y = (int(mt[623]) & 0x80000000) | (int(mt[0]) & 0x7FFFFFFF)
+    mt[623] = int(mt[396]) ^ (y >> 1) ^ (MT_MATRIX if y & 1 else 0)
+
+
+def mt_temper(mt):
+    """Tempered outputs of a whole state as a list of Python ints"""
+    y = mt ^ (mt >> 11)
+    y ^= (y << 7) & np.uint32(2636928640)
+    y ^= (y << 15) & np.uint32(4022730752)
+    y ^= y >> 18
+    return y.tolist()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Buffered solution writer
+Walls, groups and operations are appended to one bytearray and emitted with
+a single sys.stdout.write; repeated group commands are generated by
+repeating one encoded line instead of formatting each of them.
+"""
+
+import sys
+
+N = 30
+
+
+def wall_row(word, lo, width):
+    """'0'/'1' string of bits lo..lo+width-1 of word, lowest bit first"""
+    return format((word >> lo) & ((1 << width) - 1), f"0{width}b")[::-1]
+
+
+class SolutionWriter:
+    """Accumulates one solution in the output format"""
+    def __init__(self):
+        self.buf = bytearray()
+        self.ops = 0
+
+    def walls(self, wallv, wallh):
+        """Wall rows from pycho bitboards (boundary walls are not part of the output)"""
+        rows = [wall_row(wallv.words[r], 1, N - 1) for r in range(N)]
+        # wallh is transposed: gather bit r+1 of every column word into row r
+        for r in range(1, N):
+            rows.append("".join("1" if (wallh.words[c] >> r) & 1 else "0" for c in range(N)))
+        self.buf += ("\n".join(rows) + "\n").encode()
+
+    def groups(self, group):
+        self.buf += (" ".join(map(str, group)) + "\n").encode()
+
+    def group_moves(self, g, d, count):
+        """count repetitions of "g g d" """
+        if count > 0:
+            self.buf += f"g {g} {d}\n".encode() * count
+            self.ops += count
+
+    def tactic(self, g, phases):
+        """Group moves for a list of phases; (direction, count) phases move group g,
+        (direction, count, group) phases their own group"""
+        for phase in phases:
+            self.group_moves(phase[2] if len(phase) == 3 else g, phase[0], phase[1])
+
+    def robot_moves(self, i, path):
+        """Individual moves "i i d" for every direction in path"""
+        if path:
+            prefix = f"i {i} "
+            self.buf += "".join(prefix + d + "\n" for d in path).encode()
+            self.ops += len(path)
+
+    def text(self):
+        return self.buf.decode()
+
+    def flush(self, out=None):
+        """Write everything in one call and reset the buffer"""
+        (out or sys.stdout).write(self.buf.decode())
+        self.buf = bytearray()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Multi-process simulated annealing for the maze optimizer
+Runs independent SA chains with distinct seeds and keeps the lowest bv
+"""
+
+import math
+import multiprocessing
+import random
+import sys
+import time
+
+import pycho
+
+# Chains stop this long before the deadline so results make it back in time
+RESULT_MARGIN = 0.03
+
+_instance = None
+_backend = None
+_plan = None
+_params = None
+
+
+def _init_worker(instance, backend, plan, params):
+    """Receive the instance, the (group, tactic) plan and the solver's parameters once per worker process"""
+    global _instance, _backend, _plan, _params
+    _instance = instance
+    _backend = backend
+    _plan = plan
+    _params = params
+
+
+def chain_params(opt, chain, jitter):
+    """SA parameters for a chain: the tuned set, log-uniformly jittered for chains > 0"""
+    params = opt.sa_params()
+    if chain == 0 or jitter <= 0:
+        return params
+    r = random.Random(chain)
+    for key in ("t0", "tn", "tempo"):
+        params[key] *= math.exp(r.uniform(-jitter, jitter))
+    return params
+
+
+def run_chain(opt, chain, deadline, jitter):
+    """Anneal opt until deadline with the chain's seed; returns (bv, step, wallv, wallh)"""
+    # Seed the rng of the module opt's class lives in (pycho may also be __main__)
+    sys.modules[type(opt).__module__].rng.init(chain + 1)
+    params = chain_params(opt, chain, jitter)
+    bv, step = opt.anneal(max(0.0, deadline - RESULT_MARGIN - time.monotonic()), params)
+    return bv, step, opt.wallv.words[:], opt.wallh.words[:]
+
+
+def _worker_chain(args):
+    chain, deadline, jitter = args
+    opt = pycho.MazeOptimizer(backend=_backend, params=_params)
+    opt.load_instance(_instance)
+    opt.prepare()
+    opt.load_plan(_plan)
+    return run_chain(opt, chain, deadline, jitter)
+
+
+def anneal_parallel(opt, workers, deadline, jitter=0.0):
+    """Run `workers` SA chains until deadline (a time.monotonic() value) and keep the best.
+
+    Chain 0 runs in this process with the default seed; the others run in a
+    process pool. Chains still running at the deadline are dropped. The
+    winning walls are loaded into opt and its next-wall tables rebuilt.
+    Returns (bv, total steps over the collected chains).
+    """
+    pool = multiprocessing.Pool(workers - 1, initializer=_init_worker,
+                                initargs=(opt.instance(), opt.backend, opt.plan(), opt.params))
+    try:
+        jobs = pool.map_async(_worker_chain, [(chain, deadline, jitter) for chain in range(1, workers)])
+        results = [run_chain(opt, 0, deadline, jitter)]
+        try:
+            results += jobs.get(timeout=max(0.0, deadline - time.monotonic()))
+        except multiprocessing.TimeoutError:
+            pass
+    finally:
+        pool.terminate()
+
+    bv, _, wallv, wallh = min(results, key=lambda res: res[0])
+    opt.wallv.words[:] = wallv
+    opt.wallh.words[:] = wallh
+    opt.rebuild_all()
+    return bv, sum(res[1] for res in results)
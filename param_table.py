@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Per-bucket solver parameters
+Instances are keyed by K bucket and wall count W. tune.py writes a table of
+tuned parameters per key; pycho loads it at startup and falls back to the
+hand-tuned constants for keys the table does not cover (or without a table).
+"""
+
+import json
+import os
+
+PARAM_TABLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "params.json")
+
+# The two hand-tuned annealing sets, selected by ttype (K > 55 by default)
+SA_SETS = {
+    False: {"t0": 12.51129, "tn": 0.01347, "tempo": 1.15281, "removed_factor": 0.11375},
+    True: {"t0": 27.46494, "tn": 0.01022, "tempo": 2.8584, "removed_factor": 0.05508},
+}
+
+# Keys MazeOptimizer.sa_params passes on to the annealers
+SA_KEYS = ("ttype", "t0", "tn", "tempo", "removed_factor")
+
+
+def k_bucket(K):
+    if K < 33:
+        return "K<33"
+    if K <= 55:
+        return "K33-55"
+    return "K>55"
+
+
+def bucket_key(K, W):
+    return f"{k_bucket(K)}/W{W}"
+
+
+def default_params(K):
+    """The hand-tuned parameters: annealing set, temperature type and tactic offset"""
+    ttype = K > 55
+    params = {"ttype": ttype}
+    params.update(SA_SETS[ttype])
+    params["change"] = -2 if K < 33 else -1
+    return params
+
+
+def load_table(path=PARAM_TABLE):
+    """{bucket key: params} from a tune.py table, or {} if there is none"""
+    try:
+        with open(path) as f:
+            return json.load(f)["buckets"]
+    except FileNotFoundError:
+        return {}
+
+
+def lookup(table, K, W):
+    """Parameters for an instance: the defaults, overridden by the table entry of its bucket"""
+    params = default_params(K)
+    for key, value in table.get(bucket_key(K, W), {}).items():
+        if key in params:
+            params[key] = value
+    return params
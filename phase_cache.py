@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Phase-cached evaluation of the group tactic
+Robot positions are cached at every phase boundary together with the wall
+edges each phase touched, so a wall toggle only replays the phases from the
+first one that actually reaches the toggled edge.
+"""
+
+import math
+
+N = 30
+
+VERTICAL = "UD"
+
+
+def track_up(pos, n, next_wallu, touch):
+    """fmoveu_xfast on pos; ORs the wallh rows each robot reached into touch[col]"""
+    buckets = [[] for _ in range(N)]
+    for i, p in enumerate(pos):
+        buckets[p[0]].append(i)
+    next_pos = [-1] * N
+    for bucket in buckets:
+        for i in bucket:
+            y, x = pos[i]
+            ny = max(y - n, next_pos[x] + 1, next_wallu[y][x])
+            pos[i] = (ny, x)
+            next_pos[x] = ny
+            lo = ny if ny > y - n else ny + 1
+            touch[x] |= (1 << (y + 1)) - (1 << lo)
+
+
+def track_down(pos, n, next_walld, touch):
+    """fmoved_xfast on pos; ORs the wallh rows each robot reached into touch[col]"""
+    buckets = [[] for _ in range(N)]
+    for i, p in enumerate(pos):
+        buckets[N-1-p[0]].append(i)
+    next_pos = [N] * N
+    for bucket in buckets:
+        for i in bucket:
+            y, x = pos[i]
+            ny = min(y + n, next_pos[x] - 1, next_walld[y][x])
+            pos[i] = (ny, x)
+            next_pos[x] = ny
+            hi = ny + 1 if ny < y + n else ny
+            touch[x] |= (1 << (hi + 1)) - (1 << (y + 1))
+
+
+def track_left(pos, n, next_walll, touch):
+    """fmovel_xfast on pos; ORs the wallv columns each robot reached into touch[row]"""
+    buckets = [[] for _ in range(N)]
+    for i, p in enumerate(pos):
+        buckets[p[1]].append(i)
+    next_pos = [-1] * N
+    for bucket in buckets:
+        for i in bucket:
+            y, x = pos[i]
+            nx = max(x - n, next_pos[y] + 1, next_walll[y][x])
+            pos[i] = (y, nx)
+            next_pos[y] = nx
+            lo = nx if nx > x - n else nx + 1
+            touch[y] |= (1 << (x + 1)) - (1 << lo)
+
+
+def track_right(pos, n, next_wallr, touch):
+    """fmover_xfast on pos; ORs the wallv columns each robot reached into touch[row]"""
+    buckets = [[] for _ in range(N)]
+    for i, p in enumerate(pos):
+        buckets[N-1-p[1]].append(i)
+    next_pos = [N] * N
+    for bucket in buckets:
+        for i in bucket:
+            y, x = pos[i]
+            nx = min(x + n, next_pos[y] - 1, next_wallr[y][x])
+            pos[i] = (y, nx)
+            next_pos[y] = nx
+            hi = nx + 1 if nx < x + n else nx
+            touch[y] |= (1 << (hi + 1)) - (1 << (x + 1))
+
+
+def tactic_phases(maxu, maxl, maxd, maxr):
+    """The 7-phase group tactic as a list of (direction, count)"""
+    return split_tactic("ULDR", {"U": maxu, "L": maxl, "D": maxd, "R": maxr})
+
+
+def split_tactic(order, counts, split=0.5):
+    """Tactic a, b, c, d(all), c, b, a for order "abcd"; the first part of a, b
+    and c gets floor(split * count) moves. Negative counts are clamped to 0."""
+    a, b, c, d = order
+    phases = []
+    for ch in (a, b, c):
+        phases.append((ch, max(0, math.floor(counts[ch] * split))))
+    phases.append((d, max(0, counts[d])))
+    for ch in (c, b, a):
+        phases.append((ch, max(0, counts[ch]) - max(0, math.floor(counts[ch] * split))))
+    return phases
+
+
+def replay_lane(d, n, lane, starts, table):
+    """Replay one lane of a phase from start positions given in processing order.
+
+    Returns the new positions (aligned with starts) and the lane's touch mask,
+    exactly as the matching track_* kernel would produce them.
+    """
+    out = []
+    mask = 0
+    if d == "U":
+        x = lane
+        prev = -1
+        for p in starts:
+            y = p[0]
+            ny = max(y - n, prev + 1, table[y][x])
+            prev = ny
+            lo = ny if ny > y - n else ny + 1
+            mask |= (1 << (y + 1)) - (1 << lo)
+            out.append((ny, x))
+    elif d == "D":
+        x = lane
+        prev = N
+        for p in starts:
+            y = p[0]
+            ny = min(y + n, prev - 1, table[y][x])
+            prev = ny
+            hi = ny + 1 if ny < y + n else ny
+            mask |= (1 << (hi + 1)) - (1 << (y + 1))
+            out.append((ny, x))
+    elif d == "L":
+        y = lane
+        prev = -1
+        for p in starts:
+            x = p[1]
+            nx = max(x - n, prev + 1, table[y][x])
+            prev = nx
+            lo = nx if nx > x - n else nx + 1
+            mask |= (1 << (x + 1)) - (1 << lo)
+            out.append((y, nx))
+    else:
+        y = lane
+        prev = N
+        for p in starts:
+            x = p[1]
+            nx = min(x + n, prev - 1, table[y][x])
+            prev = nx
+            hi = nx + 1 if nx < x + n else nx
+            mask |= (1 << (hi + 1)) - (1 << (x + 1))
+            out.append((y, nx))
+    return out, mask
+
+
+def replay_lane_steps(d, lane, starts, steps, table):
+    """replay_lane with a move count per robot; robots with 0 steps stay put
+    as blockers and touch no wall edge."""
+    out = []
+    mask = 0
+    vertical = d in VERTICAL
+    if d in "UL":
+        prev = -1
+        for p, n in zip(starts, steps):
+            v = p[0] if vertical else p[1]
+            nv = max(v - n, prev + 1, table[v][lane] if vertical else table[lane][v])
+            prev = nv
+            lo = nv if nv > v - n else nv + 1
+            mask |= (1 << (v + 1)) - (1 << lo)
+            out.append((nv, lane) if vertical else (lane, nv))
+    else:
+        prev = N
+        for p, n in zip(starts, steps):
+            v = p[0] if vertical else p[1]
+            nv = min(v + n, prev - 1, table[v][lane] if vertical else table[lane][v])
+            prev = nv
+            hi = nv + 1 if nv < v + n else nv
+            mask |= (1 << (hi + 1)) - (1 << (v + 1))
+            out.append((nv, lane) if vertical else (lane, nv))
+    return out, mask
+
+
+def is_grouped(phases):
+    """True for plans of (direction, count, group) phases"""
+    return any(len(phase) == 3 for phase in phases)
+
+
+def phase_steps(phases, group):
+    """Per phase, None when every robot moves or the move count of each robot
+    when only the phase's group does (group[i] is robot i's group)"""
+    steps = []
+    for phase in phases:
+        if len(phase) == 3:
+            _, n, g = phase
+            steps.append([n if gi == g else 0 for gi in group])
+        else:
+            steps.append(None)
+    return steps
+
+
+def lane_members(pos, d):
+    """Robots grouped by lane for direction d, each lane in processing order"""
+    vertical = d in VERTICAL
+    key = 0 if vertical else 1
+    reverse = d in "DR"
+    buckets = [[] for _ in range(N)]
+    for i, p in enumerate(pos):
+        buckets[N-1-p[key] if reverse else p[key]].append(i)
+    members = [[] for _ in range(N)]
+    for bucket in buckets:
+        for i in bucket:
+            members[pos[i][1] if vertical else pos[i][0]].append(i)
+    return members
+
+
+class PhaseCacheEvaluator:
+    """Resumes the tactic from the earliest phase a wall toggle can affect
+
+    states[p] holds the positions at the start of phase p (states[0] is the
+    source layout, states[-1] the final one) and touch[p][lane] is a bitmask
+    of the wall edges phase p reached in that lane: wallh rows per column for
+    U/D phases, wallv columns per row for L/R phases. A toggle outside every
+    touched mask provably leaves all trajectories unchanged.
+
+    Robots in different lanes never interact within a phase, so from the
+    first affected phase on only dirty lanes are replayed: the toggled wall's
+    lane while the old run touched the edge, plus every lane a changed robot
+    leaves or enters. members[p][lane] keeps each lane's robots in processing
+    order so a dirty lane can be replayed without scanning all K robots, and
+    the score is updated from the robots whose final position changed.
+
+    Group phases (direction, count, group) move only the robots in opt.group
+    that belong to the group; the others replay with 0 steps, so they keep
+    their cell and block the movers.
+
+    markv/markh index the touched edges over all phases in the wallv/wallh
+    bitboard layout and are kept up to date on commit, so the annealer tests
+    in O(1) (bit r+1 of markh[c], or c+1 of markv[r]) whether a toggle can
+    change anything at all.
+    """
+    def __init__(self, opt, phases):
+        self.opt = opt
+        self.K = opt.K
+        self.phases = [phase[:2] for phase in phases]
+        self.steps = phase_steps(phases, opt.group[:opt.K])
+        self.dst = opt.dst[:opt.K]
+        self.states = []
+        self.touch = []
+        self.members = []
+        self.markv = [0] * (N + 2)
+        self.markh = [0] * (N + 2)
+        self.av = 0
+        self.pending = None
+        self.full_replay()
+
+    def _kernel(self, d):
+        opt = self.opt
+        if d == "U":
+            return track_up, opt.next_wallu
+        if d == "D":
+            return track_down, opt.next_walld
+        if d == "L":
+            return track_left, opt.next_walll
+        return track_right, opt.next_wallr
+
+    def full_replay(self):
+        """Rebuild the whole cache from the sources on the current walls"""
+        pos = self.opt.src[:self.K]
+        self.states = [pos[:]]
+        self.touch = []
+        self.members = []
+        for (d, n), steps in zip(self.phases, self.steps):
+            kernel, table = self._kernel(d)
+            members = lane_members(pos, d)
+            self.members.append(members)
+            lanes = [0] * N
+            if steps is None:
+                kernel(pos, n, table, lanes)
+            else:
+                for lane, robots in enumerate(members):
+                    out, lanes[lane] = replay_lane_steps(d, lane, [pos[i] for i in robots],
+                                                         [steps[i] for i in robots], table)
+                    for i, q in zip(robots, out):
+                        pos[i] = q
+            self.states.append(pos[:])
+            self.touch.append(lanes)
+        for lane in range(N):
+            self._update_marks(False, lane)
+            self._update_marks(True, lane)
+
+        av = 0
+        for (y, x), (dy, dx) in zip(pos, self.dst):
+            av += abs(x - dx) + abs(y - dy)
+        self.av = av
+        self.pending = None
+        return av
+
+    def _update_marks(self, vertical, lane):
+        """Recompute markh[lane] (vertical) or markv[lane] from the phase touch masks"""
+        mark = 0
+        for (d, _), lanes in zip(self.phases, self.touch):
+            if (d in VERTICAL) == vertical:
+                mark |= lanes[lane]
+        (self.markh if vertical else self.markv)[lane] = mark
+
+    def first_affected(self, type_op, r, c):
+        """First phase whose touched edges include the SA flip (type_op, r, c), or -1"""
+        if type_op == 0:
+            lane, bit, dirs = r, 1 << (c + 1), "LR"
+        else:
+            lane, bit, dirs = c, 1 << (r + 1), VERTICAL
+        for p, (d, _) in enumerate(self.phases):
+            if d in dirs and self.touch[p][lane] & bit:
+                return p
+        return -1
+
+    def evaluate(self, type_op, r, c):
+        """Score the tactic after the flip (type_op, r, c) has been applied to the walls"""
+        p0 = self.first_affected(type_op, r, c)
+        if p0 < 0:
+            self.pending = None
+            return self.av
+
+        if type_op == 0:
+            wall_lane, wall_bit, wall_dirs = r, 1 << (c + 1), "LR"
+        else:
+            wall_lane, wall_bit, wall_dirs = c, 1 << (r + 1), VERTICAL
+
+        changed = {}
+        updates = []
+        for p in range(p0, len(self.phases)):
+            d, n = self.phases[p]
+            steps = self.steps[p]
+            axis = 1 if d in VERTICAL else 0
+            start = self.states[p]
+            end = self.states[p+1]
+
+            dirty = set()
+            for i, q in changed.items():
+                dirty.add(start[i][axis])
+                dirty.add(q[axis])
+            if d in wall_dirs and self.touch[p][wall_lane] & wall_bit:
+                dirty.add(wall_lane)
+
+            incoming = {}
+            for i, q in changed.items():
+                incoming.setdefault(q[axis], []).append(i)
+
+            key = 1 - axis
+            reverse = d in "DR"
+            _, table = self._kernel(d)
+            lanes = {}
+            ends = {}
+            for lane in dirty:
+                robots = self.members[p][lane]
+                if changed:
+                    robots = [i for i in robots if i not in changed]
+                    if lane in incoming:
+                        robots += incoming[lane]
+                        robots.sort(key=lambda i: changed[i][key] if i in changed else start[i][key],
+                                    reverse=reverse)
+                    starts = [changed[i] if i in changed else start[i] for i in robots]
+                else:
+                    starts = [start[i] for i in robots]
+                if steps is None:
+                    out, mask = replay_lane(d, n, lane, starts, table)
+                else:
+                    out, mask = replay_lane_steps(d, lane, starts, [steps[i] for i in robots], table)
+                lanes[lane] = (robots, mask)
+                for i, q in zip(robots, out):
+                    if q != end[i]:
+                        ends[i] = q
+            updates.append((lanes, ends))
+            changed = ends
+
+        av = self.av
+        final = self.states[-1]
+        for i, (y, x) in changed.items():
+            dy, dx = self.dst[i]
+            oy, ox = final[i]
+            av += abs(x - dx) + abs(y - dy) - abs(ox - dx) - abs(oy - dy)
+        self.pending = (p0, updates, av)
+        return av
+
+    def commit(self):
+        """Keep the pending replay (the flip was accepted)"""
+        if self.pending is None:
+            return
+        p0, updates, av = self.pending
+        dirty = set()
+        for p, (lanes, ends) in enumerate(updates, p0):
+            members = self.members[p]
+            touch = self.touch[p]
+            vertical = self.phases[p][0] in VERTICAL
+            for lane, (robots, mask) in lanes.items():
+                members[lane] = robots
+                if touch[lane] != mask:
+                    touch[lane] = mask
+                    dirty.add((vertical, lane))
+            state = self.states[p+1]
+            for i, q in ends.items():
+                state[i] = q
+        for vertical, lane in dirty:
+            self._update_marks(vertical, lane)
+        self.av = av
+        self.pending = None
+
+    def discard(self):
+        """Drop the pending replay (the flip was reverted)"""
+        self.pending = None
+
+    def final_positions(self):
+        return self.states[-1]
+
+    def wall_marks(self):
+        """(wallv, wallh) bitboard words of every wall edge the tactic touched.
+
+        Every edge a robot crossed or was stopped by: wallv words per row for
+        L/R phases, transposed wallh words per column for U/D phases; the two
+        extra words of each board stay 0. The lists
+        are the live index, updated in place by commit.
+        """
+        return self.markv, self.markh
@@ -10,16 +10,47 @@ import random
 import math
 from typing import List, Tuple, Optional
 
+from bitboard import BitBoard, highest_bit_at_most, lowest_bit_at_least
+from phase_cache import PhaseCacheEvaluator, is_grouped, tactic_phases
+from distance_cache import DistanceFieldCache, route
+from output_writer import SolutionWriter
+from instance_io import read_instance
+from scheduler import CHECK_SECONDS, Scheduler
+from param_table import SA_KEYS, load_table, lookup
+from transposition import ZOBRIST_H, ZOBRIST_V, TranspositionTable, wall_hash
+import instrument
+
 # Constants
 SILENT = True
+BACKEND = "python"  # "python" or "numpy" sweep kernels for the SA loop
+BATCH_SIZE = 0  # numpy backend only: >0 scores this many wall flips per batch
+PHASE_CACHE = True  # python backend: replay only the phases a wall flip can affect
+WORKERS = 1  # >1 runs independent SA chains in a process pool and keeps the best
+REPLICAS = 1  # >1 replaces the cooling schedule with replica exchange over this many temperatures
+TT_SIZE = 1 << 16  # layouts remembered by the annealer's transposition table (0 disables it)
+TACTICS = 1  # >1 searches this many group move tactics instead of only the fixed 7-phase one
+CALIBRATION_ROBOTS = 4  # robots routed before annealing to measure the BFS cost
+GROUPS = 1  # >1 clusters robots into up to this many groups, each with its own tactic, if that is estimated cheaper
+PARAMS = load_table()  # per-bucket parameters written by tune.py ({} without params.json)
 DIRS = "UDLR"
 MAXK = 100
 N = 30
 
+INV_2_32 = 1.0 / 4294967296.0
+
 class RNG:
-    """Mersenne Twister random number generator"""
+    """Mersenne Twister random number generator
+    
+    Outputs are tempered a whole 624-word block at a time into buf; index is
+    the next unread position and index == len(buf) means the state has to be
+    regenerated first. Hot loops can read words straight from buf (see
+    reserve()); next(x) is (word * x) >> 32 and next_double() is
+    (word + 0.5) / 2^32. When numpy is already loaded the block is
+    regenerated with vectorized kernels, with identical output.
+    """
     def __init__(self, seed=1):
         self.MT = [0] * 624
+        self.buf = []
         self.index = 0
         self.init(seed)
     
@@ -27,33 +58,60 @@ class RNG:
         self.MT[0] = seed
         for i in range(1, 624):
             self.MT[i] = (1812433253 * (self.MT[i-1] ^ (self.MT[i-1] >> 30)) + i) & 0xFFFFFFFF
+        self.buf = []
         self.index = 0
     
     def generate(self):
+        """Advance the state by one block and return its tempered outputs"""
+        if "numpy" in sys.modules:
+            import numpy as np
+            from numpy_kernels import mt_twist, mt_temper
+            mt = np.array(self.MT, dtype=np.uint32)
+            mt_twist(mt)
+            self.MT = mt.tolist()
+            return mt_temper(mt)
+        
+        MT = self.MT
         MULT = [0, 2567483615]
         for i in range(227):
-            y = (self.MT[i] & 0x80000000) + (self.MT[i+1] & 0x7FFFFFFF)
-            self.MT[i] = self.MT[i+397] ^ (y >> 1)
-            self.MT[i] ^= MULT[y & 1]
+            y = (MT[i] & 0x80000000) + (MT[i+1] & 0x7FFFFFFF)
+            MT[i] = MT[i+397] ^ (y >> 1) ^ MULT[y & 1]
         
         for i in range(227, 623):
-            y = (self.MT[i] & 0x80000000) + (self.MT[i+1] & 0x7FFFFFFF)
-            self.MT[i] = self.MT[i-227] ^ (y >> 1)
-            self.MT[i] ^= MULT[y & 1]
-        
-        y = (self.MT[623] & 0x80000000) + (self.MT[0] & 0x7FFFFFFF)
-        self.MT[623] = self.MT[623-227] ^ (y >> 1)
-        self.MT[623] ^= MULT[y & 1]
+            y = (MT[i] & 0x80000000) + (MT[i+1] & 0x7FFFFFFF)
+            MT[i] = MT[i-227] ^ (y >> 1) ^ MULT[y & 1]
+        
+        y = (MT[623] & 0x80000000) + (MT[0] & 0x7FFFFFFF)
+        MT[623] = MT[623-227] ^ (y >> 1) ^ MULT[y & 1]
+        
+        out = []
+        for y in MT:
+            y ^= y >> 11
+            y ^= (y << 7) & 2636928640
+            y ^= (y << 15) & 4022730752
+            out.append(y ^ (y >> 18))
+        return out
+    
+    def reserve(self, count):
+        """Make at least count unread words available; returns (buf, index).
+        
+        Callers may consume buf[index:index+count] directly as long as they
+        store their final position back into self.index.
+        """
+        if len(self.buf) - self.index < count:
+            buf = self.buf[self.index:]
+            while len(buf) < count:
+                buf += self.generate()
+            self.buf = buf
+            self.index = 0
+        return self.buf, self.index
     
     def rand(self):
-        if self.index == 0:
-            self.generate()
-        y = self.MT[self.index]
-        y ^= y >> 11
-        y ^= (y << 7) & 2636928640
-        y ^= (y << 15) & 4022730752
-        y ^= y >> 18
-        self.index = 0 if self.index == 623 else self.index + 1
+        if self.index == len(self.buf):
+            self.buf = self.generate()
+            self.index = 0
+        y = self.buf[self.index]
+        self.index += 1
         return y
     
     def next(self, x=None):
@@ -65,33 +123,44 @@ class RNG:
         return a + self.next(b - a)
     
     def next_double(self):
-        return (self.rand() + 0.5) * (1.0 / 4294967296.0)
+        return (self.rand() + 0.5) * INV_2_32
     
     def next_double_range(self, a, b):
         return a + self.next_double() * (b - a)
-
+    
 # Global variables
 rng = RNG()
 
 class MazeOptimizer:
-    def __init__(self):
+    def __init__(self, backend=BACKEND, batch_size=BATCH_SIZE, workers=WORKERS, jitter=0.0,
+                 replicas=REPLICAS, tactics=TACTICS, groups=GROUPS, params=None):
+        self.backend = backend
+        # Fixed parameters (see param_table.default_params) instead of the PARAMS lookup
+        self.param_override = params
+        self.params = {}
+        self.batch_size = batch_size
+        self.workers = workers
+        self.jitter = jitter
+        self.replicas = replicas
+        self.tactics = tactics
+        self.groups = groups
+        self.group = []
+        self.sweeper = None
         self.K = 0
         self.src = [(0, 0) for _ in range(MAXK)]
         self.dst = [(0, 0) for _ in range(MAXK)]
         
-        # Wall arrays
-        self.owallv = [[0 for _ in range(N+2)] for _ in range(N+2)]
-        self.owallh = [[0 for _ in range(N+2)] for _ in range(N+2)]
-        self.wallv = [[0 for _ in range(N+2)] for _ in range(N+2)]
-        self.wallh = [[0 for _ in range(N+2)] for _ in range(N+2)]
+        # Wall bitboards: vertical walls stored per row, horizontal walls per column
+        self.owallv = BitBoard(N+2, N+2)
+        self.owallh = BitBoard(N+2, N+2, transposed=True)
+        self.wallv = BitBoard(N+2, N+2)
+        self.wallh = BitBoard(N+2, N+2, transposed=True)
+        # Zobrist hash of wallv/wallh, kept by toggle_wall and rebuild_all
+        self.zhash = 0
         
         # Position and cell tracking
         self.pos = [(0, 0) for _ in range(MAXK)]
-        self.cell = [[0 for _ in range(N)] for _ in range(N)]
-        
-        # Wall marking
-        self.wallv_mark = [[-1 for _ in range(N+2)] for _ in range(N+2)]
-        self.wallh_mark = [[-1 for _ in range(N+2)] for _ in range(N+2)]
+        self.cell = BitBoard(N, N)
         
         # Next wall tracking
         self.next_wallu = [[0 for _ in range(N)] for _ in range(N)]
@@ -103,22 +172,33 @@ class MazeOptimizer:
         self.order = [[0 for _ in range(N)] for _ in range(N)]
         self.n_order = [0 for _ in range(N)]
         
-        # Best solution tracking
-        self.best = []
+        # Best (bv, tactic, wallv, wallh) kept by save_best, None until the first
+        self.best = None
+        
+        # BFS buffers, allocated once and reused by every find_path call
+        self.bfs_adj = [[] for _ in range(N*N)]
+        self.bfs_seen = [0] * (N*N)
+        self.bfs_dist = [0] * (N*N)
+        self.bfs_prv = [''] * (N*N)
+        self.bfs_queue = [0] * (N*N)
+        self.bfs_stamp = 0
+        
+        # Per-destination distance fields, keyed by wall layout
+        self.fields = DistanceFieldCache()
+        self.route_adj = []
+        self.layout_key = None
         
         # Copy arrays for state saving
-        self.cell_copy = [[0 for _ in range(N)] for _ in range(N)]
+        self.cell_copy = BitBoard(N, N)
         self.pos_copy = [(0, 0) for _ in range(MAXK)]
     
     def reset(self):
         """Reset positions to source"""
-        for i in range(N):
-            for j in range(N):
-                self.cell[i][j] = 0
+        self.cell.clear_all()
         
         for i in range(self.K):
             self.pos[i] = self.src[i]
-            self.cell[self.src[i][0]][self.src[i][1]] = 1
+            self.cell.set(self.src[i][0], self.src[i][1])
     
     def fast_reset(self):
         """Fast reset positions to source"""
@@ -127,49 +207,76 @@ class MazeOptimizer:
     
     def state_save(self):
         """Save current state"""
-        for i in range(N):
-            for j in range(N):
-                self.cell_copy[i][j] = self.cell[i][j]
-        
-        for i in range(self.K):
-            self.pos_copy[i] = self.pos[i]
+        self.cell_copy.load(self.cell)
+        self.pos_copy[:self.K] = self.pos[:self.K]
     
     def state_load(self):
         """Load saved state"""
-        for i in range(N):
-            for j in range(N):
-                self.cell[i][j] = self.cell_copy[i][j]
-        
-        for i in range(self.K):
-            self.pos[i] = self.pos_copy[i]
+        self.cell.load(self.cell_copy)
+        self.pos[:self.K] = self.pos_copy[:self.K]
     
     def rebuild_next_wall_col(self, c):
         """Rebuild next wall column"""
+        w = self.wallh.words[c]
         for r in range(N):
-            if r == 0:
-                self.next_wallu[r][c] = -1 if not self.wallh[r][c] else r
-            else:
-                self.next_wallu[r][c] = r if self.wallh[r][c] else self.next_wallu[r-1][c]
+            self.next_wallu[r][c] = highest_bit_at_most(w, r)
+            e = lowest_bit_at_least(w, r+1)
+            self.next_walld[r][c] = N if e < 0 else e - 1
         
-        for r in range(N-1, -1, -1):
-            if r == N-1:
-                self.next_walld[r][c] = N if not self.wallh[r+1][c] else r
-            else:
-                self.next_walld[r][c] = r if self.wallh[r+1][c] else self.next_walld[r+1][c]
+        if self.sweeper is not None:
+            self.sweeper.sync_col(c)
     
     def rebuild_next_wall_row(self, r):
         """Rebuild next wall row"""
+        w = self.wallv.words[r]
         for c in range(N):
-            if c == 0:
-                self.next_walll[r][c] = -1 if not self.wallv[r][c] else c
-            else:
-                self.next_walll[r][c] = c if self.wallv[r][c] else self.next_walll[r][c-1]
+            self.next_walll[r][c] = highest_bit_at_most(w, c)
+            e = lowest_bit_at_least(w, c+1)
+            self.next_wallr[r][c] = N if e < 0 else e - 1
         
-        for c in range(N-1, -1, -1):
-            if c == N-1:
-                self.next_wallr[r][c] = N if not self.wallv[r][c+1] else c
-            else:
-                self.next_wallr[r][c] = c if self.wallv[r][c+1] else self.next_wallr[r][c+1]
+        if self.sweeper is not None:
+            self.sweeper.sync_row(r)
+    
+    def update_next_wall_row(self, r, c):
+        """Refresh row r after wallv[r][c] was toggled; touches only the runs next to the wall"""
+        # Cells lo..c-1 look right towards the wall, cells c..hi look left towards it
+        nwl = self.next_walll[r]
+        nwr = self.next_wallr[r]
+        lo = nwl[c-1]
+        hi = nwr[c]
+        if self.wallv.get(r, c):
+            for j in range(c, hi + 1):
+                nwl[j] = c
+            for j in range(lo, c):
+                nwr[j] = c - 1
+        else:
+            for j in range(c, hi + 1):
+                nwl[j] = lo
+            for j in range(lo, c):
+                nwr[j] = hi
+        
+        if self.sweeper is not None:
+            self.sweeper.sync_row(r)
+    
+    def update_next_wall_col(self, r, c):
+        """Refresh column c after wallh[r][c] was toggled; touches only the runs next to the wall"""
+        nwu = self.next_wallu
+        nwd = self.next_walld
+        lo = nwu[r-1][c]
+        hi = nwd[r][c]
+        if self.wallh.get(r, c):
+            for j in range(r, hi + 1):
+                nwu[j][c] = r
+            for j in range(lo, r):
+                nwd[j][c] = r - 1
+        else:
+            for j in range(r, hi + 1):
+                nwu[j][c] = lo
+            for j in range(lo, r):
+                nwd[j][c] = hi
+        
+        if self.sweeper is not None:
+            self.sweeper.sync_col(c)
     
     def fmoveu_xfast(self, n):
         """Fast move up"""
@@ -251,131 +358,124 @@ class MazeOptimizer:
                 self.pos[i] = (y, new_x)
                 next_pos[y] = new_x
     
-    def fmoveu_markwall(self):
-        """Move up with wall marking"""
-        for i in range(N):
-            self.n_order[i] = 0
-        
-        for i in range(self.K):
-            y = self.pos[i][0]
-            self.order[y][self.n_order[y]] = i
-            self.n_order[y] += 1
-        
-        for j in range(N):
-            for k in range(self.n_order[j]):
-                i = self.order[j][k]
-                y, x = self.pos[i]
-                self.wallh_mark[y][x] = 1
-                if not self.wallh[y][x] and not self.cell[y-1][x]:
-                    self.cell[y][x] = 0
-                    self.pos[i] = (y-1, x)
-                    self.cell[y-1][x] = 1
-    
-    def fmoved_markwall(self):
-        """Move down with wall marking"""
-        for i in range(N):
-            self.n_order[i] = 0
-        
-        for i in range(self.K):
-            y = self.pos[i][0]
-            self.order[N-1-y][self.n_order[N-1-y]] = i
-            self.n_order[N-1-y] += 1
-        
-        for j in range(N):
-            for k in range(self.n_order[j]):
-                i = self.order[j][k]
-                y, x = self.pos[i]
-                self.wallh_mark[y+1][x] = 1
-                if not self.wallh[y+1][x] and not self.cell[y+1][x]:
-                    self.cell[y][x] = 0
-                    self.pos[i] = (y+1, x)
-                    self.cell[y+1][x] = 1
-    
-    def fmovel_markwall(self):
-        """Move left with wall marking"""
-        for i in range(N):
-            self.n_order[i] = 0
-        
-        for i in range(self.K):
-            x = self.pos[i][1]
-            self.order[x][self.n_order[x]] = i
-            self.n_order[x] += 1
-        
-        for j in range(N):
-            for k in range(self.n_order[j]):
-                i = self.order[j][k]
-                y, x = self.pos[i]
-                self.wallv_mark[y][x] = 1
-                if not self.wallv[y][x] and not self.cell[y][x-1]:
-                    self.cell[y][x] = 0
-                    self.pos[i] = (y, x-1)
-                    self.cell[y][x-1] = 1
-    
-    def fmover_markwall(self):
-        """Move right with wall marking"""
-        for i in range(N):
-            self.n_order[i] = 0
-        
-        for i in range(self.K):
-            x = self.pos[i][1]
-            self.order[N-1-x][self.n_order[N-1-x]] = i
-            self.n_order[N-1-x] += 1
-        
-        for j in range(N):
-            for k in range(self.n_order[j]):
-                i = self.order[j][k]
-                y, x = self.pos[i]
-                self.wallv_mark[y][x+1] = 1
-                if not self.wallv[y][x+1] and not self.cell[y][x+1]:
-                    self.cell[y][x] = 0
-                    self.pos[i] = (y, x+1)
-                    self.cell[y][x+1] = 1
+    def toggle_wall(self, type_op, r, c):
+        """Flip wallv[r][c+1] (type 0) or wallh[r+1][c] (type 1); returns True if a wall was removed"""
+        if type_op == 0:
+            removed = self.wallv.toggle(r, c+1) == 0
+            self.update_next_wall_row(r, c+1)
+            self.zhash ^= ZOBRIST_V[r*N + c]
+            return removed
+        removed = self.wallh.toggle(r+1, c) == 0
+        self.zhash ^= ZOBRIST_H[r*N + c]
+        self.update_next_wall_col(r+1, c)
+        return removed
     
-    def solve(self):
-        """Main solving algorithm"""
-        # Read input
-        _, self.K = map(int, input().split())
-        
+    def draw_flips(self, count):
+        """Draw count SA wall flips that do not touch the original walls"""
+        flips = []
+        while len(flips) < count:
+            type_op = rng.next(2)
+            if type_op == 0:
+                r = rng.next(N)
+                c = rng.next(N-1)
+                if self.owallv.get(r, c+1):
+                    continue
+            else:
+                r = rng.next(N-1)
+                c = rng.next(N)
+                if self.owallh.get(r+1, c):
+                    continue
+            flips.append((type_op, r, c))
+        return flips
+    
+    def run_tactic(self, tactic):
+        """Simulate a tactic (list of (direction, count)) from the sources and return the distance sum"""
+        if is_grouped(tactic):
+            return PhaseCacheEvaluator(self, tactic).av
+        
+        sw = self.sweeper
+        if sw is not None:
+            sw.fast_reset()
+            moves = {"U": sw.fmoveu_xfast, "D": sw.fmoved_xfast, "L": sw.fmovel_xfast, "R": sw.fmover_xfast}
+            for d, n in tactic:
+                moves[d](n)
+            return sw.score()
+        
+        self.fast_reset()
+        moves = {"U": self.fmoveu_xfast, "D": self.fmoved_xfast, "L": self.fmovel_xfast, "R": self.fmover_xfast}
+        for d, n in tactic:
+            moves[d](n)
+        
+        av = 0
         for i in range(self.K):
-            sy, sx, dy, dx = map(int, input().split())
-            self.src[i] = (sy, sx)
-            self.dst[i] = (dy, dx)
-        
-        # Read walls
+            av += abs(self.pos[i][1] - self.dst[i][1]) + abs(self.pos[i][0] - self.dst[i][0])
+        return av
+    
+    def read_input(self, stream=None):
+        """Read the instance from stdin (or stream)"""
+        inst = read_instance(stream)
+        self.K = inst.K
+        self.src[:self.K] = inst.src
+        self.dst[:self.K] = inst.dst
+        
+        # Boundary walls are set by prepare()
+        inner = ((1 << N) - 1) & ~1
         for r in range(N):
-            s = input().strip()
-            for c in range(min(len(s), N)):
-                self.owallv[r][c+1] = 1 if s[c] == '1' else 0
-        
-        for r in range(N-1):
-            s = input().strip()
-            for c in range(min(len(s), N)):
-                self.owallh[r+1][c] = 1 if s[c] == '1' else 0
-        
+            self.owallv.words[r] = inst.wall_v[r] & inner
+        for r in range(1, N):
+            word = inst.wall_h[r]
+            while word:
+                c = (word & -word).bit_length() - 1
+                self.owallh.set(r, c)
+                word &= word - 1
+    
+    def instance(self):
+        """Picklable snapshot of the instance for worker processes"""
+        return (self.K, self.src[:self.K], self.dst[:self.K],
+                self.owallv.words[:], self.owallh.words[:])
+    
+    def load_instance(self, inst):
+        """Load an instance produced by instance()"""
+        self.K, src, dst, wallv_words, wallh_words = inst
+        self.src[:self.K] = src
+        self.dst[:self.K] = dst
+        self.owallv.words[:] = wallv_words
+        self.owallh.words[:] = wallh_words
+    
+    def plan(self):
+        """Picklable (group, tactic) snapshot, for optimizers built with load_instance"""
+        return self.group[:self.K], self.tactic[:]
+    
+    def load_plan(self, plan):
+        """Use the groups and tactic of plan() (call after prepare)"""
+        group, tactic = plan
+        self.group = list(group)
+        self.tactic = list(tactic)
+    
+    def prepare(self):
+        """Derive instance statistics and tactic bounds, and reset walls to the original ones"""
         # Count walls
         W = 0
         for r in range(N):
             for c in range(N):
-                if self.owallv[r][c+1] and (r == 0 or not self.owallv[r-1][c+1]):
+                if self.owallv.get(r, c+1) and (r == 0 or not self.owallv.get(r-1, c+1)):
                     W += 1
-                if self.owallh[r+1][c] and (c == 0 or not self.owallh[r+1][c-1]):
+                if self.owallh.get(r+1, c) and (c == 0 or not self.owallh.get(r+1, c-1)):
                     W += 1
-        
-        print(f"[DATA] W = {W}")
+        self.W = W
         
         # Set boundary walls
         for i in range(N):
-            self.owallv[i][0] = self.owallv[i][N] = 1
-            self.owallh[0][i] = self.owallh[N][i] = 1
-        
-        print(f"[DATA] K = {self.K}")
+            self.owallv.set(i, 0)
+            self.owallv.set(i, N)
+            self.owallh.set(0, i)
+            self.owallh.set(N, i)
         
         # Calculate total distance
         total_dist = 0
         for i in range(self.K):
             total_dist += abs(self.src[i][1] - self.dst[i][1]) + abs(self.src[i][0] - self.dst[i][0])
-        
-        print(f"[DATA] total_dist = {total_dist}")
+        self.total_dist = total_dist
         
         # Calculate optimal solution bounds
         maxu = maxd = maxl = maxr = 0
@@ -385,274 +485,594 @@ class MazeOptimizer:
             maxl = max(maxl, self.dst[i][1] - self.src[i][1])
             maxr = max(maxr, self.src[i][1] - self.dst[i][1])
         
-        change = -2 if self.K < 33 else -1
-        maxu += change
-        maxd += change
-        maxl += change
-        maxr += change
-        
-        optimal = maxu + maxd + maxl + maxr
-        print(f"[DATA] optimal = {optimal}")
+        if self.param_override is not None:
+            self.params = dict(self.param_override)
+        else:
+            self.params = lookup(PARAMS, self.K, W)
+        change = self.params["change"]
+        self.change = change
+        self.maxu = maxu + change
+        self.maxd = maxd + change
+        self.maxl = maxl + change
+        self.maxr = maxr + change
+        self.optimal = self.maxu + self.maxd + self.maxl + self.maxr
+        self.tactic = tactic_phases(self.maxu, self.maxl, self.maxd, self.maxr)
+        self.group = [0] * self.K
+        self.best = None
+        # Transposition table totals over every anneal call
+        self.tt_hits = 0
+        self.tt_misses = 0
         
         # Initialize walls
-        for r in range(N+2):
-            for c in range(N+2):
-                self.wallv[r][c] = self.owallv[r][c]
-                self.wallh[r][c] = self.owallh[r][c]
-                self.wallv_mark[r][c] = -1
-                self.wallh_mark[r][c] = -1
-        
-        # Initialize next wall arrays
+        self.wallv.load(self.owallv)
+        self.wallh.load(self.owallh)
+        self.rebuild_all()
+    
+    def rebuild_all(self):
+        """Rebuild every next-wall table, the wall hash (and the NumPy mirror) from the current walls"""
+        self.sweeper = None
+        self.zhash = wall_hash(self.wallv.words, self.wallh.words)
         for i in range(N):
             self.rebuild_next_wall_col(i)
             self.rebuild_next_wall_row(i)
         
-        # Simulated annealing parameters
-        TIME_SCALE = 1.0
-        CUTOFF = 1.85278
-        TIME_LIMIT = CUTOFF * TIME_SCALE
-        TIME_LIMIT_BFS = 1.94 * TIME_SCALE
-        
-        ttype = self.K > 55
-        t0 = 27.46494 if ttype else 12.51129
-        tn = 0.01022 if ttype else 0.01347
+        if self.backend == "numpy":
+            from numpy_kernels import NumpySweeper
+            self.sweeper = NumpySweeper(self)
+    
+    def sa_params(self):
+        """Annealing parameters for this instance (a copy, callers may modify it)"""
+        return {key: self.params[key] for key in SA_KEYS}
+    
+    def anneal(self, time_limit, params=None):
+        """Anneal the extra walls for time_limit seconds; returns (bv, step).
+        
+        On the phase-cached path the walls end as the best state seen, already
+        pruned of walls no robot touched.
+        """
+        # Setup (evaluator construction) counts against time_limit too
+        start_time = time.monotonic()
+        if params is None:
+            params = self.sa_params()
+        tactic = self.tactic
+        TIME_LIMIT = max(time_limit, 1e-9)
+        # Steps between clock reads, recalibrated from the measured step rate
+        next_check = 1
+        check_every = 1
+        
+        ttype = params["ttype"]
+        t0 = params["t0"]
+        tn = params["tn"]
         t = t0
         
-        tempo = 2.8584 if ttype else 1.15281
-        removed_factor = 0.05508 if ttype else 0.11375
+        tempo = params["tempo"]
+        removed_factor = params["removed_factor"]
+        
+        grouped = is_grouped(tactic)
+        batch_size = self.batch_size if self.sweeper is not None and not grouped else 0
+        pending = []
+        evaluator = None
+        if (self.sweeper is None or grouped) and PHASE_CACHE:
+            evaluator = PhaseCacheEvaluator(self, tactic)
         
-        start_time = time.time()
         step = 0
+        accepted = 0
+        unreached = 0
         bv = 10**9
+        if evaluator is not None:
+            # Start from the known score, so no flip is judged against the sentinel
+            bv = evaluator.av
+            # Live touched-edge index; flips outside it cannot change av
+            markv, markh = evaluator.wall_marks()
+        # Scores of visited layouts by wall hash (the tactic is fixed for this run)
+        table = TranspositionTable(TT_SIZE) if TT_SIZE and not batch_size else None
+        
+        # Pruned walls of the best state seen (phase-cached path only)
+        best_av = bv
+        best_walls = None
+        
+        # Unbatched steps read rng words straight from its buffer (at most 5 per step)
+        words, wi = rng.reserve(0)
         
         # Simulated annealing loop
         while True:
             step += 1
-            if (step & 511) == 0:
-                time_passed = (time.time() - start_time) / TIME_LIMIT
+            if step >= next_check:
+                elapsed = time.monotonic() - start_time
+                time_passed = elapsed / TIME_LIMIT
                 if time_passed > 1.0:
                     break
                 t = t0 * (tn / t0) ** (time_passed ** tempo)
+                if elapsed > 0:
+                    check_every = min(2 * check_every, max(1, int(step * CHECK_SECONDS / elapsed)))
+                next_check = step + check_every
             
-            type_op = rng.next(2)
-            removed = False
-            
-            if type_op == 0:
-                r = rng.next(N)
-                c = rng.next(N-1)
-                if self.owallv[r][c+1]:
-                    continue
-                self.wallv[r][c+1] = 1 - self.wallv[r][c+1]
-                removed = self.wallv[r][c+1] == 0
-                self.rebuild_next_wall_row(r)
-            elif type_op == 1:
-                r = rng.next(N-1)
-                c = rng.next(N)
-                if self.owallh[r+1][c]:
-                    continue
-                self.wallh[r+1][c] = 1 - self.wallh[r+1][c]
-                removed = self.wallh[r+1][c] == 0
-                self.rebuild_next_wall_col(c)
-            
-            # Test solution
-            self.fast_reset()
-            self.fmoveu_xfast(maxu // 2)
-            self.fmovel_xfast(maxl // 2)
-            self.fmoved_xfast(maxd // 2)
-            self.fmover_xfast(maxr)
-            self.fmoved_xfast(maxd - maxd // 2)
-            self.fmovel_xfast(maxl - maxl // 2)
-            self.fmoveu_xfast(maxu - maxu // 2)
-            
-            av = 0
-            for i in range(self.K):
-                av += abs(self.pos[i][1] - self.dst[i][1]) + abs(self.pos[i][0] - self.dst[i][0])
+            if batch_size:
+                # Consume candidates scored against the current walls
+                if not pending:
+                    flips = self.draw_flips(batch_size)
+                    scores = self.sweeper.run_tactic_batch(flips, tactic).tolist()
+                    pending = [(f[0], f[1], f[2], a) for f, a in zip(flips, scores)]
+                    pending.reverse()
+                type_op, r, c, av = pending.pop()
+                if type_op == 0:
+                    removed = self.wallv.get(r, c+1) == 1
+                else:
+                    removed = self.wallh.get(r+1, c) == 1
+            else:
+                if wi + 5 > len(words):
+                    rng.index = wi
+                    words, wi = rng.reserve(5)
+                type_op = words[wi] >> 31
+                
+                if type_op == 0:
+                    r = (words[wi+1] * N) >> 32
+                    c = (words[wi+2] * (N-1)) >> 32
+                    wi += 3
+                    if self.owallv.get(r, c+1):
+                        continue
+                    reached = evaluator is None or (markv[r] >> (c+1)) & 1
+                else:
+                    r = (words[wi+1] * (N-1)) >> 32
+                    c = (words[wi+2] * N) >> 32
+                    wi += 3
+                    if self.owallh.get(r+1, c):
+                        continue
+                    reached = evaluator is None or (markh[c] >> (r+1)) & 1
+                av = None
+                if not reached:
+                    # No trajectory reaches the edge: av is unchanged
+                    unreached += 1
+                    av = bv
+                elif table is not None:
+                    key = self.zhash ^ (ZOBRIST_V if type_op == 0 else ZOBRIST_H)[r*N + c]
+                    av = table.get(key)
+                applied = av is None
+                if applied:
+                    removed = self.toggle_wall(type_op, r, c)
+                    
+                    # Test solution
+                    if evaluator is not None:
+                        av = evaluator.evaluate(type_op, r, c)
+                    else:
+                        av = self.run_tactic(tactic)
+                    if table is not None:
+                        table.put(key, av)
+                else:
+                    # The wall is only toggled if the flip is accepted
+                    if type_op == 0:
+                        removed = self.wallv.get(r, c+1) == 1
+                    else:
+                        removed = self.wallh.get(r+1, c) == 1
             
             # Accept or reject
-            if (av < bv or 
-                (ttype and (removed or rng.next_double() < removed_factor) and av < bv + rng.next_double() * t) or
-                (not ttype and (removed or rng.next_double() < removed_factor) and rng.next_double() < math.exp((bv - av) / t))):
+            if batch_size:
+                accept = (av < bv or
+                          (ttype and (removed or rng.next_double() < removed_factor) and av < bv + rng.next_double() * t) or
+                          (not ttype and (removed or rng.next_double() < removed_factor) and rng.next_double() < math.exp((bv - av) / t)))
+            else:
+                # Same draws as the batch branch, read from the local word buffer
+                accept = av < bv
+                if not accept:
+                    accept = removed
+                    if not accept:
+                        accept = (words[wi] + 0.5) * INV_2_32 < removed_factor
+                        wi += 1
+                    if accept:
+                        u = (words[wi] + 0.5) * INV_2_32
+                        wi += 1
+                        accept = av < bv + u * t if ttype else u < math.exp((bv - av) / t)
+            if accept:
                 if not SILENT and av < bv:
-                    print(f"[DEBUG] step={step}, av={av}")
+                    print(f"[DEBUG] step={step}, av={av}", file=sys.stderr)
                 bv = av
-            else:
+                accepted += 1
+                if not batch_size and not applied:
+                    self.toggle_wall(type_op, r, c)
+                    if reached and evaluator is not None:
+                        # Cache hit: replay to bring the phase cache up to date
+                        evaluator.evaluate(type_op, r, c)
+                if evaluator is not None:
+                    evaluator.commit()
+                    if av < best_av:
+                        best_av = av
+                        best_walls = ([w & (m | o) for w, m, o in zip(self.wallv.words, markv, self.owallv.words)],
+                                      [w & (m | o) for w, m, o in zip(self.wallh.words, markh, self.owallh.words)])
+                if batch_size:
+                    # Remaining candidates were scored against the old walls
+                    self.toggle_wall(type_op, r, c)
+                    pending = []
+            elif not batch_size and applied:
                 # Revert changes
-                if type_op == 0:
-                    self.wallv[r][c+1] = 1 - self.wallv[r][c+1]
-                    self.rebuild_next_wall_row(r)
-                elif type_op == 1:
-                    self.wallh[r+1][c] = 1 - self.wallh[r+1][c]
-                    self.rebuild_next_wall_col(c)
+                self.toggle_wall(type_op, r, c)
+                if evaluator is not None:
+                    evaluator.discard()
+        
+        if not batch_size:
+            rng.index = wi
+        if best_walls is not None and best_av < bv:
+            self.wallv.words[:] = best_walls[0]
+            self.wallh.words[:] = best_walls[1]
+            self.rebuild_all()
+            bv = best_av
+        instrument.count("sa.steps", step)
+        instrument.count("sa.accepted", accepted)
+        instrument.count("sa.unreached", unreached)
+        if table is not None:
+            self.tt_hits += table.hits
+            self.tt_misses += table.misses
+            instrument.count("tt.hits", table.hits)
+            instrument.count("tt.misses", table.misses)
+        return bv, step
+    
+    def prune_walls(self, marks):
+        """Remove every added wall outside marks ((wallv, wallh) words); returns the count removed"""
+        removed = 0
+        for wall, mark, owall in ((self.wallv, marks[0], self.owallv),
+                                  (self.wallh, marks[1], self.owallh)):
+            for i in range(N+2):
+                unused = wall.words[i] & ~mark[i] & ~owall.words[i]
+                wall.words[i] ^= unused
+                removed += unused.bit_count()
+        return removed
+    
+    def plan_cost(self, plan):
+        """Estimated score of plan() on the current walls: its group commands plus
+        one individual move per cell of distance the tactic leaves"""
+        saved = self.plan()
+        self.load_plan(plan)
+        av = PhaseCacheEvaluator(self, self.tactic).av
+        self.load_plan(saved)
+        return sum(phase[1] for phase in plan[1]) + av
+    
+    def plan_groups(self, count):
+        """Cluster the robots into at most count groups by displacement and switch
+        to an interleaved multi-group plan if plan_cost rates it below the
+        single-group tactic (every group command moves one group only, so the
+        grouped plan pays its direction sweeps once per group)"""
+        from grouping import cluster_displacements, grouped_plan
+        src = self.src[:self.K]
+        dst = self.dst[:self.K]
+        group = cluster_displacements(src, dst, count)
+        if max(group) == 0:
+            return
+        plan = (group, grouped_plan(src, dst, group, self.change))
+        if self.plan_cost(plan) < self.plan_cost(self.plan()):
+            self.load_plan(plan)
+    
+    def save_best(self, bv):
+        """Remember the current walls and tactic if bv beats the best so far"""
+        if self.best is None or bv < self.best[0]:
+            self.best = (bv, self.tactic[:], self.wallv.words[:], self.wallh.words[:])
+    
+    def load_best(self):
+        """Restore the walls and tactic stored by save_best; returns their bv"""
+        bv, tactic, wallv, wallh = self.best
+        self.tactic = tactic[:]
+        self.wallv.words[:] = wallv
+        self.wallh.words[:] = wallh
+        self.rebuild_all()
+        return bv
+    
+    def run_sa(self, tactic, time_limit, walls=None):
+        """Anneal the walls for tactic, starting from walls ((wallv, wallh) words)
+        or the original walls; the result goes through save_best. Returns (bv, step)"""
+        deadline = time.monotonic() + time_limit
+        self.tactic = tactic
+        if walls is None:
+            walls = (self.owallv.words, self.owallh.words)
+        self.wallv.words[:] = walls[0]
+        self.wallh.words[:] = walls[1]
+        self.rebuild_all()
+        bv, step = self.anneal(max(0.0, deadline - time.monotonic()))
+        self.save_best(bv)
+        return bv, step
+    
+    def calibrate_bfs(self, sched, sample=CALIBRATION_ROBOTS):
+        """Time the BFS graph and routing of the sample farthest robots on the
+        original walls, and give sched the measured cost of the bfs phase"""
+        self.reset()
+        t = time.monotonic()
+        self.build_bfs_graph()
+        graph = time.monotonic() - t
+        far = sorted(range(self.K), key=lambda i: -abs(self.src[i][0] - self.dst[i][0])
+                     - abs(self.src[i][1] - self.dst[i][1]))[:sample]
+        t = time.monotonic()
+        for i in far:
+            self.route_robot(i)
+        per_robot = (time.monotonic() - t) / max(1, len(far))
+        sched.measured("bfs", graph, per_robot)
+    
+    def solve(self, stream=None, out=None, sched=None):
+        """Main solving algorithm: instance from stream (stdin), solution to out (stdout),
+        time budget from sched (by default the judge limit, counted from process start)"""
+        with instrument.phase("setup"):
+            self.read_input(stream)
+            self.prepare()
+            if self.groups > 1:
+                self.plan_groups(self.groups)
+        optimal = sum(phase[1] for phase in self.tactic)
+        
+        print(f"[DATA] W = {self.W}", file=sys.stderr)
+        print(f"[DATA] K = {self.K}", file=sys.stderr)
+        print(f"[DATA] total_dist = {self.total_dist}", file=sys.stderr)
+        print(f"[DATA] optimal = {optimal}", file=sys.stderr)
+        
+        # Annealing gets whatever the later phases and the safety margin leave
+        if sched is None:
+            sched = Scheduler()
+        with instrument.phase("calibrate"):
+            self.calibrate_bfs(sched)
+        TIME_LIMIT = sched.anneal_budget(self.K)
+        print(f"[DATA] anneal_budget = {TIME_LIMIT:.3f}", file=sys.stderr)
+        
+        start_time = time.monotonic()
+        with instrument.phase("anneal"):
+            if self.replicas > 1:
+                from replica_exchange import anneal_tempering
+                bv, step, swap_rates = anneal_tempering(self, self.replicas, start_time + TIME_LIMIT)
+                print(f"[DATA] swap_rates = {' '.join(f'{x:.3f}' for x in swap_rates)}", file=sys.stderr)
+            elif self.workers > 1:
+                from parallel_sa import anneal_parallel
+                bv, step = anneal_parallel(self, self.workers, start_time + TIME_LIMIT, self.jitter)
+            elif self.tactics > 1:
+                from tactic_search import search_tactics
+                bv, step = search_tactics(self, TIME_LIMIT, self.tactics)
+                print(f"[DATA] tactic = {' '.join(f'{phase[0]}{phase[1]}' for phase in self.tactic)}", file=sys.stderr)
+            else:
+                bv, step = self.anneal(TIME_LIMIT)
         
-        print(f"[DATA] bv = {bv}")
-        print(f"[DATA] step = {step}")
+        print(f"[DATA] bv = {bv}", file=sys.stderr)
+        print(f"[DATA] step = {step}", file=sys.stderr)
+        print(f"[DATA] tt_hits = {self.tt_hits}", file=sys.stderr)
+        print(f"[DATA] tt_misses = {self.tt_misses}", file=sys.stderr)
         
         # Final optimization with wall removal
-        for loop in range(2):
-            self.reset()
+        with instrument.phase("prune"):
+            # Removing walls no phase touched leaves every trajectory unchanged,
+            # so one pass suffices
+            evaluator = PhaseCacheEvaluator(self, self.tactic)
+            walls_removed = self.prune_walls(evaluator.wall_marks())
+            print(f"[DATA] walls_removed = {walls_removed}", file=sys.stderr)
+            self.cell.clear_all()
+            for i, (y, x) in enumerate(evaluator.final_positions()):
+                self.pos[i] = (y, x)
+                self.cell.set(y, x)
+        
+        with instrument.phase("output"):
+            # Output solution
+            writer = SolutionWriter()
+            writer.walls(self.wallv, self.wallh)
+            writer.groups(self.group[:self.K])
             
-            for r in range(N+2):
-                for c in range(N+2):
-                    self.wallv_mark[r][c] = 0
-                    self.wallh_mark[r][c] = 0
-            
-            for i in range(maxu // 2):
-                self.fmoveu_markwall()
-            for i in range(maxl // 2):
-                self.fmovel_markwall()
-            for i in range(maxd // 2):
-                self.fmoved_markwall()
-            for i in range(maxr):
-                self.fmover_markwall()
-            for i in range(maxd // 2, maxd):
-                self.fmoved_markwall()
-            for i in range(maxl // 2, maxl):
-                self.fmovel_markwall()
-            for i in range(maxu // 2, maxu):
-                self.fmoveu_markwall()
-            
-            walls_removed = 0
-            for r in range(N+2):
-                for c in range(N+2):
-                    if not self.wallv_mark[r][c] and self.wallv[r][c] and not self.owallv[r][c]:
-                        self.wallv[r][c] = 0
-                        walls_removed += 1
-                    if not self.wallh_mark[r][c] and self.wallh[r][c] and not self.owallh[r][c]:
-                        self.wallh[r][c] = 0
-                        walls_removed += 1
-        
-        # Output solution
-        for r in range(N):
-            for c in range(N-1):
-                print(self.wallv[r][c+1], end='')
-            print()
-        
-        for r in range(N-1):
-            for c in range(N):
-                print(self.wallh[r+1][c], end='')
-            print()
-        
-        for i in range(self.K):
-            print(0, end=' ')
-        print()
-        
-        # Output movement sequence
-        for i in range(maxu//2):
-            print("g 0 U")
-        for i in range(maxl//2):
-            print("g 0 L")
-        for i in range(maxd//2):
-            print("g 0 D")
-        for i in range(maxr):
-            print("g 0 R")
-        for i in range(maxd//2, maxd):
-            print("g 0 D")
-        for i in range(maxl//2, maxl):
-            print("g 0 L")
-        for i in range(maxu//2, maxu):
-            print("g 0 U")
-        
-        elapsed_time = time.time() - start_time
-        print(f"elapsed()={elapsed_time:.3f}")
-        print(f"good={self.K}")
-        print(f"best_bfs_value={bv}")
-        
-        # BFS optimization phase
-        self.state_save()
-        bfs_order = []
-        best_bfs_value = optimal
-        
-        last_good = 0
-        for i in range(self.K):
-            if self.pos[i] == self.dst[i]:
-                bfs_order.append(i)
-        
+            # Output movement sequence
+            writer.tactic(0, self.tactic)
+        
+        elapsed_time = time.monotonic() - start_time
+        print(f"elapsed()={elapsed_time:.3f}", file=sys.stderr)
+        print(f"good={self.K}", file=sys.stderr)
+        print(f"best_bfs_value={bv}", file=sys.stderr)
+        
+        # BFS cleanup phase: route the remaining robots individually
+        self.build_bfs_graph()
+        max_ops = self.K * N * N - sum(phase[1] for phase in self.tactic)
+        ex = optimal
         bfs_step = 0
-        while last_good < self.K:
-            order = list(range(self.K))
-            order_value = [0] * self.K
-            
-            for i in range(self.K):
-                order_value[i] = abs(self.pos[i][1] - self.dst[i][1]) + abs(self.pos[i][0] - self.dst[i][0])
-            
-            order.sort(key=lambda x: order_value[x])
+        
+        with instrument.phase("bfs"):
+            last_good = 0
+            out_of_time = False
+            while last_good < self.K and not out_of_time:
+                order_value = [abs(self.pos[i][1] - self.dst[i][1]) + abs(self.pos[i][0] - self.dst[i][0])
+                               for i in range(self.K)]
+                order = sorted(range(self.K), key=lambda x: -order_value[x])
             
-            for i in order:
-                if self.pos[i] == self.dst[i]:
-                    continue
-                
-                # Simple pathfinding (simplified version)
-                path = self.find_path(i)
-                if path:
-                    for move in path:
-                        bfs_step += 1
-                        print(f"i {i} {move}")
-                        if bfs_step > 100000:  # Limit BFS steps
-                            break
-                    if bfs_step > 100000:
+                good = 0
+                for i in order:
+                    if self.pos[i] == self.dst[i]:
+                        good += 1
+                        continue
+                    if sched.hard_remaining() <= 0:
+                        # Hard stop reached: leave the rest where the tactic put them
+                        out_of_time = True
                         break
+                
+                    path = self.route_robot(i)
+                    if not path or bfs_step + len(path) > max_ops:
+                        continue
+                    self.imovepath(path, i)
+                    writer.robot_moves(i, path)
+                    bfs_step += len(path)
+                    ex += len(path)
+                    good += 1
             
-            if bfs_step > 100000:
-                break
-            
-            # Check if all items are in place
-            all_good = True
-            for i in range(self.K):
-                if self.pos[i] != self.dst[i]:
-                    all_good = False
+                if good == last_good:
                     break
-            
-            if all_good:
-                break
+                last_good = good
         
-        print(f"[DATA] bfs_step = {bfs_step}")
-        print(f"best_bfs_value={bv}")
+        print(f"[DATA] bfs_step = {bfs_step}", file=sys.stderr)
+        print(f"[DATA] bfs_timeout = {int(out_of_time)}", file=sys.stderr)
         
-        # Individual item movements
+        failed = 0
         for i in range(self.K):
             if self.pos[i] != self.dst[i]:
-                # Simple movement towards destination
-                dy = self.dst[i][0] - self.pos[i][0]
-                dx = self.dst[i][1] - self.pos[i][1]
-                
-                if dy > 0:
-                    print(f"i {i} D")
-                elif dy < 0:
-                    print(f"i {i} U")
-                elif dx > 0:
-                    print(f"i {i} R")
-                elif dx < 0:
-                    print(f"i {i} L")
-        
-        print(f"[DATA] failed = 0")
-        print(f"[DATA] ex = {bv}")
-        print(f"[DATA] time = {elapsed_time:.5f}")
-    
-    def find_path(self, item_id):
-        """Simplified pathfinding for individual items"""
-        # This is a simplified version - the original C++ has more complex BFS
-        src_pos = self.pos[item_id]
-        dst_pos = self.dst[item_id]
+                failed = 1
+                ex += (abs(self.pos[i][1] - self.dst[i][1]) + abs(self.pos[i][0] - self.dst[i][0])) * 100
+        
+        print(f"best_bfs_value={ex}", file=sys.stderr)
+        with instrument.phase("write"):
+            writer.flush(out)
+        print(f"[DATA] failed = {failed}", file=sys.stderr)
+        print(f"[DATA] ex = {ex}", file=sys.stderr)
+        print(f"[DATA] time = {elapsed_time:.5f}", file=sys.stderr)
+        print(f"[DATA] total_time = {sched.elapsed():.5f}", file=sys.stderr)
+    
+    def imovepath(self, path, id):
+        """Apply individual moves for robot id; blocked moves leave it in place"""
+        for ch in path:
+            y, x = self.pos[id]
+            if ch == 'U':
+                if not self.wallh.get(y, x) and not self.cell.get(y-1, x):
+                    self.cell.clear(y, x)
+                    self.pos[id] = (y-1, x)
+                    self.cell.set(y-1, x)
+            elif ch == 'D':
+                if not self.wallh.get(y+1, x) and not self.cell.get(y+1, x):
+                    self.cell.clear(y, x)
+                    self.pos[id] = (y+1, x)
+                    self.cell.set(y+1, x)
+            elif ch == 'L':
+                if not self.wallv.get(y, x) and not self.cell.get(y, x-1):
+                    self.cell.clear(y, x)
+                    self.pos[id] = (y, x-1)
+                    self.cell.set(y, x-1)
+            elif ch == 'R':
+                if not self.wallv.get(y, x+1) and not self.cell.get(y, x+1):
+                    self.cell.clear(y, x)
+                    self.pos[id] = (y, x+1)
+                    self.cell.set(y, x+1)
+            else:
+                raise ValueError(f"bad move {ch!r}")
+    
+    def build_bfs_graph(self):
+        """Precompute wall-free neighbours of every flat cell id for find_path"""
+        adj = self.bfs_adj
+        for r in range(N):
+            for c in range(N):
+                nb = []
+                if not self.wallh.get(r, c):
+                    nb.append(((r-1)*N + c, r-1, 1 << c, 'U'))
+                if not self.wallh.get(r+1, c):
+                    nb.append(((r+1)*N + c, r+1, 1 << c, 'D'))
+                if not self.wallv.get(r, c):
+                    nb.append((r*N + c-1, r, 1 << (c-1), 'L'))
+                if not self.wallv.get(r, c+1):
+                    nb.append((r*N + c+1, r, 1 << (c+1), 'R'))
+                adj[r*N + c] = nb
+        
+        self.route_adj = [[(nid, ch) for nid, _, _, ch in nb] for nb in adj]
+        self.layout_key = (tuple(self.wallv.words), tuple(self.wallh.words))
+    
+    def route_robot(self, i):
+        """Path for robot i to its destination via the cached distance fields.
+        
+        Falls back to find_path when the destination is unreachable with the
+        other robots in place.
+        """
+        p0 = self.pos[i]
+        p1 = self.dst[i]
+        occupied = {y*N + x for y, x in self.pos[:self.K]}
+        path = route(self.fields, self.layout_key, self.route_adj,
+                     p0[0]*N + p0[1], p1[0]*N + p1[1], occupied)
+        if path is None:
+            return self.find_path(p0, p1)
+        return path
+    
+    def find_path(self, p0, p1):
+        """BFS from p0 to p1 around walls and robots.
+        
+        If p1 is unreachable the path leads to the reachable cell minimising
+        100 * (Manhattan distance to p1) - (BFS distance from p0); exact ties
+        go to the highest flat cell id, like the C++ <= scan. Visit marks use
+        a generation stamp so the flat buffers are never cleared or
+        reallocated.
+        """
+        if p0 == p1:
+            return ""
+        
+        self.bfs_stamp += 1
+        stamp = self.bfs_stamp
+        seen = self.bfs_seen
+        dist = self.bfs_dist
+        prv = self.bfs_prv
+        queue = self.bfs_queue
+        adj = self.bfs_adj
+        cw = self.cell.words
+        
+        s = p0[0] * N + p0[1]
+        t = p1[0] * N + p1[1]
+        seen[s] = stamp
+        dist[s] = 1
+        queue[0] = s
+        qst = 0
+        qen = 1
+        while qst < qen:
+            v = queue[qst]
+            qst += 1
+            if v == t:
+                break
+            dv = dist[v] + 1
+            for nid, nr, bit, ch in adj[v]:
+                if seen[nid] != stamp and not cw[nr] & bit:
+                    seen[nid] = stamp
+                    dist[nid] = dv
+                    prv[nid] = ch
+                    queue[qen] = nid
+                    qen += 1
+        
+        if seen[t] != stamp:
+            ty, tx = p1
+            bv = 1000000
+            bp = s
+            for k in range(qen):
+                v = queue[k]
+                r, c = divmod(v, N)
+                av = (abs(r - ty) + abs(c - tx)) * 100 - dist[v]
+                if av < bv or (av == bv and v > bp):
+                    bv = av
+                    bp = v
+            t = bp
         
         path = []
-        dy = dst_pos[0] - src_pos[0]
-        dx = dst_pos[1] - src_pos[1]
-        
-        # Simple direct path
-        if dy > 0:
-            path.extend(['D'] * dy)
-        elif dy < 0:
-            path.extend(['U'] * (-dy))
-        
-        if dx > 0:
-            path.extend(['R'] * dx)
-        elif dx < 0:
-            path.extend(['L'] * (-dx))
-        
-        return path
+        while t != s:
+            ch = prv[t]
+            path.append(ch)
+            if ch == 'U':
+                t += N
+            elif ch == 'D':
+                t -= N
+            elif ch == 'L':
+                t += 1
+            else:
+                t -= 1
+        path.reverse()
+        return "".join(path)
+
+# Methods timed when instrumentation is enabled (see instrument.py)
+PROFILED_METHODS = (
+    "fmoveu_xfast", "fmoved_xfast", "fmovel_xfast", "fmover_xfast",
+    "rebuild_next_wall_row", "rebuild_next_wall_col", "update_next_wall_row", "update_next_wall_col",
+    "toggle_wall", "run_tactic", "anneal",
+    "build_bfs_graph", "route_robot", "find_path", "imovepath",
+)
 
 def main():
-    optimizer = MazeOptimizer()
+    backend = BACKEND
+    batch_size = BATCH_SIZE
+    workers = WORKERS
+    jitter = 0.0
+    replicas = REPLICAS
+    tactics = TACTICS
+    groups = GROUPS
+    for arg in sys.argv[1:]:
+        if arg.startswith("--backend="):
+            backend = arg.split("=", 1)[1]
+        elif arg.startswith("--batch="):
+            batch_size = int(arg.split("=", 1)[1])
+        elif arg.startswith("--workers="):
+            workers = int(arg.split("=", 1)[1])
+        elif arg.startswith("--jitter="):
+            jitter = float(arg.split("=", 1)[1])
+        elif arg.startswith("--replicas="):
+            replicas = int(arg.split("=", 1)[1])
+        elif arg.startswith("--tactics="):
+            tactics = int(arg.split("=", 1)[1])
+        elif arg.startswith("--groups="):
+            groups = int(arg.split("=", 1)[1])
+    instrument.wrap(MazeOptimizer, PROFILED_METHODS)
+    instrument.wrap(PhaseCacheEvaluator, ("evaluate", "commit", "discard", "full_replay"))
+    optimizer = MazeOptimizer(backend=backend, batch_size=batch_size, workers=workers, jitter=jitter,
+                              replicas=replicas, tactics=tactics, groups=groups)
     optimizer.solve()
 
 if __name__ == "__main__":
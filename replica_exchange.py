@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Replica-exchange (parallel tempering) annealer for the maze optimizer
+Replicas sit on a fixed geometric temperature ladder and periodically swap
+temperatures, replacing the hand-tuned cooling schedule
+"""
+
+import math
+import sys
+import time
+
+from phase_cache import PhaseCacheEvaluator
+from scheduler import CHECK_SECONDS
+
+# SA steps each replica runs between two rounds of swap attempts
+SWEEP_STEPS = 64
+
+
+class Replica:
+    """One wall configuration with its own phase-cached evaluator.
+
+    module is the pycho module the solver runs from (it may be __main__),
+    so replicas share its rng; params are the solver's resolved parameters.
+    """
+    def __init__(self, module, instance, plan, params):
+        self.rng = module.rng
+        self.opt = module.MazeOptimizer(backend="python", params=params)
+        self.opt.load_instance(instance)
+        self.opt.prepare()
+        self.opt.load_plan(plan)
+        opt = self.opt
+        self.evaluator = PhaseCacheEvaluator(opt, opt.tactic)
+        self.bv = self.evaluator.av
+
+    def step(self, t, removed_factor):
+        """One Metropolis step at temperature t"""
+        rng = self.rng
+        opt = self.opt
+        ev = self.evaluator
+        type_op, r, c = opt.draw_flips(1)[0]
+        removed = opt.toggle_wall(type_op, r, c)
+        av = ev.evaluate(type_op, r, c)
+        if (av < self.bv or
+                (removed or rng.next_double() < removed_factor) and rng.next_double() < math.exp((self.bv - av) / t)):
+            ev.commit()
+            self.bv = av
+        else:
+            opt.toggle_wall(type_op, r, c)
+            ev.discard()
+
+
+def temperature_ladder(t_lo, t_hi, count):
+    """count temperatures spaced geometrically from t_lo to t_hi"""
+    if count == 1:
+        return [t_lo]
+    return [t_lo * (t_hi / t_lo) ** (k / (count - 1)) for k in range(count)]
+
+
+def anneal_tempering(opt, count, deadline):
+    """Run count replicas until deadline (a time.monotonic() value) and keep the best walls.
+
+    rung[k] is the replica currently at temperature ladder[k]; adjacent rungs
+    try to swap after every SWEEP_STEPS steps, alternating even and odd pairs.
+    The clock is read inside the sweeps about every CHECK_SECONDS, so the run
+    ends within one step of the deadline. The best walls seen by any replica
+    (checked after every step) are loaded into opt. Returns
+    (bv, total steps, swap acceptance rate per adjacent rung pair).
+    """
+    params = opt.sa_params()
+    ladder = temperature_ladder(params["tn"], params["t0"], count)
+    removed_factor = params["removed_factor"]
+    module = sys.modules[type(opt).__module__]
+    instance = opt.instance()
+    plan = opt.plan()
+    replicas = [Replica(module, instance, plan, opt.params) for _ in range(count)]
+    rung = list(range(count))
+
+    best = min(replicas, key=lambda rep: rep.bv)
+    bv = best.bv
+    best_walls = (best.opt.wallv.words[:], best.opt.wallh.words[:])
+
+    attempts = [0] * (count - 1)
+    accepts = [0] * (count - 1)
+    step = 0
+    rounds = 0
+    rng = module.rng
+    start = time.monotonic()
+    next_check = 1
+    check_every = 1
+    running = start < deadline
+    while running:
+        for k in range(count):
+            rep = replicas[rung[k]]
+            t = ladder[k]
+            for _ in range(SWEEP_STEPS):
+                rep.step(t, removed_factor)
+                step += 1
+                if rep.bv < bv:
+                    bv = rep.bv
+                    best_walls = (rep.opt.wallv.words[:], rep.opt.wallh.words[:])
+                if step >= next_check:
+                    now = time.monotonic()
+                    if now >= deadline:
+                        running = False
+                        break
+                    # Recalibrated from the measured step rate, like MazeOptimizer.anneal
+                    check_every = min(2 * check_every, max(1, int(step * CHECK_SECONDS / max(now - start, 1e-9))))
+                    next_check = step + check_every
+            if not running:
+                break
+        if not running:
+            break
+
+        for k in range(rounds & 1, count - 1, 2):
+            a = replicas[rung[k]]
+            b = replicas[rung[k+1]]
+            delta = (1.0 / ladder[k] - 1.0 / ladder[k+1]) * (a.bv - b.bv)
+            attempts[k] += 1
+            if delta >= 0 or rng.next_double() < math.exp(delta):
+                rung[k], rung[k+1] = rung[k+1], rung[k]
+                accepts[k] += 1
+        rounds += 1
+
+    opt.wallv.words[:] = best_walls[0]
+    opt.wallh.words[:] = best_walls[1]
+    opt.rebuild_all()
+    rates = [accepts[k] / attempts[k] if attempts[k] else 0.0 for k in range(count - 1)]
+    return bv, step, rates
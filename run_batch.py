@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Batch runner: solves every seed in a directory on a process pool and scores
+the outputs in-process with scorer.py
+Rows of the per-seed table are appended as cases finish, so an interrupted
+run keeps everything solved so far; aggregate stats go to stdout at the end.
+
+--in may be a seed directory or a corpus file packed by corpus.py.
+
+Usage: python3 run_batch.py [--solver=pycho.py] [--in=in] [--out=out]
+           [--workers=4] [--time-limit=2.0] [--seeds=0-99] [--table=out/results.tsv]
+           [--best=best_scores.tsv] [-- solver args...]
+"""
+
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+
+import scorer
+
+# A case is killed after this multiple of the time limit (it still counts as TLE)
+KILL_FACTOR = 2.0
+
+HEADER = "seed\tK\tW\tscore\telapsed\tstatus\trel\n"
+
+
+def case_stats(input_text):
+    """(K, W) of an instance; W counts the wall segments the generator placed"""
+    input = scorer.parse_input(input_text)
+    N = input.N
+    W = 0
+    for i in range(N):
+        for j in range(N - 1):
+            if input.wall_v[i][j] and (i == 0 or not input.wall_v[i-1][j]):
+                W += 1
+    for i in range(N - 1):
+        for j in range(N):
+            if input.wall_h[i][j] and (j == 0 or not input.wall_h[i][j-1]):
+                W += 1
+    return input.K, W
+
+
+def run_case(args):
+    """Solve and score one seed; returns a result dict"""
+    seed, input_text, solver, solver_args, out_dir, time_limit = args
+    K, W = case_stats(input_text)
+    cmd = [sys.executable, solver] + solver_args
+    start = time.time()
+    try:
+        proc = subprocess.run(cmd, input=input_text, capture_output=True, text=True,
+                              timeout=time_limit * KILL_FACTOR)
+        output, errors, code = proc.stdout, proc.stderr, proc.returncode
+    except subprocess.TimeoutExpired as e:
+        output = e.stdout.decode() if isinstance(e.stdout, bytes) else (e.stdout or "")
+        errors = e.stderr.decode() if isinstance(e.stderr, bytes) else (e.stderr or "")
+        code = None
+    elapsed = time.time() - start
+
+    with open(os.path.join(out_dir, seed + ".txt"), "w") as f:
+        f.write(output)
+    if errors:
+        with open(os.path.join(out_dir, seed + ".err"), "w") as f:
+            f.write(errors)
+
+    score, err, _ = scorer.score_text(input_text, output)
+    if code is None:
+        status = "KILLED"
+        score = 0
+    elif code != 0:
+        status = f"RE({code})"
+        score = 0
+    elif err:
+        status = "WA: " + err
+        score = 0
+    elif elapsed > time_limit:
+        status = "TLE"
+    else:
+        status = "OK"
+    return {"seed": seed, "K": K, "W": W, "score": score, "elapsed": elapsed, "status": status}
+
+
+def parse_seeds(spec, in_dir):
+    """Seed names from "a-b" / "a,b,c" ranges, or every seed in in_dir when spec is empty"""
+    if not spec and os.path.isfile(in_dir):
+        from corpus import Corpus
+        return [f"{int(seed):04d}" for seed in Corpus(in_dir).seeds]
+    if not spec:
+        return sorted(name[:-4] for name in os.listdir(in_dir) if name.endswith(".txt"))
+    seeds = []
+    for part in spec.split(","):
+        if "-" in part:
+            lo, hi = part.split("-")
+            seeds += [f"{s:04d}" for s in range(int(lo), int(hi) + 1)]
+        else:
+            seeds.append(f"{int(part):04d}")
+    return seeds
+
+
+def load_best(path):
+    best = {}
+    if path and os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                seed, score = line.split()
+                best[seed] = int(score)
+    return best
+
+
+def save_best(path, best):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        for seed in sorted(best):
+            f.write(f"{seed}\t{best[seed]}\n")
+    os.replace(tmp, path)
+
+
+def relative(best, seed, score):
+    """AtCoder-style relative score in percent (lower raw score is better)"""
+    if score <= 0:
+        return 0.0
+    return 100.0 * min(best.get(seed, score), score) / score
+
+
+def read_inputs(in_dir, seeds):
+    """Input texts of seeds, from a directory of .txt files or a packed corpus file"""
+    if os.path.isfile(in_dir):
+        from corpus import Corpus
+        packed = Corpus(in_dir)
+        return [packed.text(int(seed)) for seed in seeds]
+    texts = []
+    for seed in seeds:
+        with open(os.path.join(in_dir, seed + ".txt")) as f:
+            texts.append(f.read())
+    return texts
+
+
+def run_batch(solver, solver_args, in_dir, out_dir, seeds, workers, time_limit, table, best_path):
+    os.makedirs(out_dir, exist_ok=True)
+    best = load_best(best_path)
+    cases = [(seed, text, solver, solver_args, out_dir, time_limit)
+             for seed, text in zip(seeds, read_inputs(in_dir, seeds))]
+
+    results = []
+    with open(table, "w") as f, multiprocessing.Pool(workers) as pool:
+        f.write(HEADER)
+        f.flush()
+        for res in pool.imap_unordered(run_case, cases):
+            res["rel"] = relative(best, res["seed"], res["score"])
+            results.append(res)
+            f.write(f"{res['seed']}\t{res['K']}\t{res['W']}\t{res['score']}\t"
+                    f"{res['elapsed']:.3f}\t{res['status']}\t{res['rel']:.2f}\n")
+            f.flush()
+            print(f"{res['seed']} score={res['score']} time={res['elapsed']:.2f} {res['status']}",
+                  file=sys.stderr)
+
+    if best_path:
+        for res in results:
+            if res["score"] > 0 and res["score"] < best.get(res["seed"], float("inf")):
+                best[res["seed"]] = res["score"]
+        save_best(best_path, best)
+    return results
+
+
+def summarize(results):
+    n = len(results)
+    if n == 0:
+        return "no cases"
+    scored = [res["score"] for res in results if res["score"] > 0]
+    lines = [
+        f"cases = {n}",
+        f"mean score = {sum(scored) / len(scored) if scored else 0:.1f}",
+        f"mean relative = {sum(res['rel'] for res in results) / n:.2f}",
+        f"max elapsed = {max(res['elapsed'] for res in results):.3f}",
+        f"TLE = {sum(res['status'] in ('TLE', 'KILLED') for res in results)}",
+        f"failed = {sum(res['score'] == 0 for res in results)}",
+    ]
+    return "\n".join(lines)
+
+
+def main():
+    solver = "pycho.py"
+    in_dir = "in"
+    out_dir = "out"
+    workers = os.cpu_count() or 1
+    time_limit = 2.0
+    seeds = ""
+    table = None
+    best_path = "best_scores.tsv"
+    argv = sys.argv[1:]
+    solver_args = []
+    if "--" in argv:
+        k = argv.index("--")
+        argv, solver_args = argv[:k], argv[k+1:]
+    for arg in argv:
+        if arg.startswith("--solver="):
+            solver = arg.split("=", 1)[1]
+        elif arg.startswith("--in="):
+            in_dir = arg.split("=", 1)[1]
+        elif arg.startswith("--out="):
+            out_dir = arg.split("=", 1)[1]
+        elif arg.startswith("--workers="):
+            workers = int(arg.split("=", 1)[1])
+        elif arg.startswith("--time-limit="):
+            time_limit = float(arg.split("=", 1)[1])
+        elif arg.startswith("--seeds="):
+            seeds = arg.split("=", 1)[1]
+        elif arg.startswith("--table="):
+            table = arg.split("=", 1)[1]
+        elif arg.startswith("--best="):
+            best_path = arg.split("=", 1)[1]
+    if table is None:
+        table = os.path.join(out_dir, "results.tsv")
+
+    results = run_batch(solver, solver_args, in_dir, out_dir, parse_seeds(seeds, in_dir),
+                        workers, time_limit, table, best_path)
+    print(summarize(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Deadline-aware time budget for one solver run
+All times are taken on the monotonic clock and measured from process start
+(read from /proc when available, else from the import of this module), so
+interpreter startup and input parsing count against the limit. The budget
+left after a safety margin is split between annealing and the phases that
+follow it. Their cost starts from fixed estimates; the solver replaces the
+BFS estimate by a measurement taken at runtime before annealing. Phases
+that still overrun may use the safety margin, up to a hard stop just
+before the limit.
+"""
+
+import os
+import time
+
+# Judge time limit per case, the part of it that is never planned into and
+# the part that is never used at all (output flush and process exit)
+TIME_LIMIT = 2.0
+SAFETY_MARGIN = 0.08
+EXIT_MARGIN = 0.02
+
+# Target interval between clock reads in the annealing loop
+CHECK_SECONDS = 0.002
+
+# Headroom applied to costs measured at runtime
+COST_FACTOR = 2.0
+
+# Fallback cost of each phase after annealing as (seconds, seconds per robot):
+# about twice the idle-machine measurements, BFS graph construction in bfs
+PHASE_COSTS = {
+    "prune": (0.002, 0.0),
+    "output": (0.001, 0.0),
+    "bfs": (0.008, 0.0008),
+    "write": (0.0005, 0.0),
+}
+
+
+def process_age():
+    """Seconds since this process started, or None if /proc is unavailable"""
+    try:
+        with open("/proc/self/stat") as f:
+            # Fields after the parenthesised command name; starttime is field 22
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return max(0.0, uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+_age = process_age()
+PROCESS_START = time.monotonic() - (_age or 0.0)
+
+
+class Scheduler:
+    """Budget of one run: limit seconds from start, margin kept in reserve"""
+    def __init__(self, limit=TIME_LIMIT, margin=SAFETY_MARGIN, start=PROCESS_START):
+        self.limit = limit
+        self.margin = margin
+        self.start = start
+        self.costs = dict(PHASE_COSTS)
+
+    def elapsed(self):
+        return time.monotonic() - self.start
+
+    def remaining(self):
+        """Seconds left before the safety margin (negative once it is reached).
+
+        A margin below EXIT_MARGIN would let the plan overlap the hard stop,
+        so at least EXIT_MARGIN is always kept back.
+        """
+        return self.limit - max(self.margin, EXIT_MARGIN) - self.elapsed()
+
+    def hard_remaining(self):
+        """Seconds left before the hard stop (negative once it is reached)"""
+        return self.limit - EXIT_MARGIN - self.elapsed()
+
+    def measured(self, name, seconds, per_robot=0.0):
+        """Replace the estimate of phase name by a runtime measurement, with COST_FACTOR headroom"""
+        self.costs[name] = (COST_FACTOR * seconds, COST_FACTOR * per_robot)
+
+    def reserve(self, K, phases=("prune", "output", "bfs", "write")):
+        """Estimated seconds the given post-annealing phases need for K robots"""
+        return sum(self.costs[name][0] + self.costs[name][1] * K for name in phases)
+
+    def anneal_budget(self, K):
+        """Seconds annealing may use now so that every later phase still fits"""
+        return max(0.0, self.remaining() - self.reserve(K))
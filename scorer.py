@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Python port of the official tools scorer (src/lib.rs)
+parse_input / parse_output / compute_score follow the Rust rules exactly:
+walls are OR-ed with the input, group commands move the robots farthest in
+the move direction first, blocked robots stay put and at most K*N^2
+operations are allowed. Score is T + 100 * sum of Manhattan distances.
+
+Usage: python3 scorer.py <input> <output>
+"""
+
+import sys
+
+from instance_io import parse_instance
+
+DIR = "UDLR"
+
+
+class Input:
+    def __init__(self, N, K, ss, ts, wall_v, wall_h):
+        self.N = N
+        self.K = K
+        self.ss = ss
+        self.ts = ts
+        self.wall_v = wall_v
+        self.wall_h = wall_h
+
+
+class Output:
+    def __init__(self, wall_v, wall_h, group, out):
+        self.wall_v = wall_v
+        self.wall_h = wall_h
+        self.group = group
+        self.out = out
+
+
+def parse_input(f):
+    """Parse an instance; wall_v is N x (N-1) and wall_h (N-1) x N lists of bools"""
+    inst = parse_instance(f)
+    wall_v, wall_h = inst.wall_lists()
+    return Input(inst.N, inst.K, inst.src, inst.dst, wall_v, wall_h)
+
+
+def _read_int(token, lo, hi):
+    if token is None:
+        raise ValueError("Unexpected EOF")
+    digits = token[1:] if token[:1] == '+' else token
+    if not (digits.isascii() and digits.isdigit()):
+        raise ValueError(f"Parse error: {token}")
+    v = int(digits)
+    if not lo <= v < hi:
+        raise ValueError(f"Out of range: {v}")
+    return v
+
+
+def _read_char(token, lo, hi):
+    if token is None:
+        raise ValueError("Unexpected EOF")
+    if len(token) != 1:
+        raise ValueError(f"Parse error: {token}")
+    if not lo <= token <= hi:
+        raise ValueError(f"Out of range: {token}")
+    return token
+
+
+def parse_output(input, f):
+    """Parse a solver output; raises ValueError with the Rust tool's message on illegal output"""
+    N = input.N
+    K = input.K
+    tokens = f.split()
+    it = iter(tokens)
+    wall_v = [row[:] for row in input.wall_v]
+    wall_h = [row[:] for row in input.wall_h]
+    for i in range(N):
+        s = next(it, None)
+        if s is None:
+            raise ValueError("Unexpected EOF")
+        if len(s) != N - 1:
+            raise ValueError("Illegal output format for v")
+        for j in range(N - 1):
+            if s[j] != '0' and s[j] != '1':
+                raise ValueError(f"Invalid character in v: {s[j]}")
+            wall_v[i][j] |= s[j] == '1'
+    for i in range(N - 1):
+        s = next(it, None)
+        if s is None:
+            raise ValueError("Unexpected EOF")
+        if len(s) != N:
+            raise ValueError("Illegal output format for h")
+        for j in range(N):
+            if s[j] != '0' and s[j] != '1':
+                raise ValueError(f"Invalid character in h: {s[j]}")
+            wall_h[i][j] |= s[j] == '1'
+    group = [_read_int(next(it, None), 0, K) for _ in range(K)]
+    out = []
+    limit = K * N * N
+    for a in it:
+        a = _read_char(a, 'a', 'z')
+        if a != 'g' and a != 'i':
+            raise ValueError(f"Invalid a[t] character: {a}")
+        b = _read_int(next(it, None), 0, K)
+        d = _read_char(next(it, None), 'A', 'Z')
+        if d not in DIR:
+            raise ValueError(f"Invalid direction: {d}")
+        out.append((a, b, DIR.index(d)))
+        if len(out) > limit:
+            raise ValueError("Too many moves")
+    return Output(wall_v, wall_h, group, out)
+
+
+def compute_score_details(input, out, t=None):
+    """Replay the first t operations; returns (score, err, final positions).
+
+    Costs about one step per robot a command actually moves, plus one sort per
+    run of identical group commands: a maximum-size solver output
+    (K * N^2 operations) scores in about 0.1 s, an adversarial one whose
+    group commands all differ from the previous one in about 1.3 s.
+    """
+    N = input.N
+    K = input.K
+    if t is None:
+        t = len(out.out)
+
+    # Flat cell ids with per-direction "move is blocked" tables
+    blocked = [bytearray(N * N) for _ in range(4)]
+    for i in range(N):
+        for j in range(N):
+            v = i * N + j
+            blocked[0][v] = i == 0 or out.wall_h[i-1][j]
+            blocked[1][v] = i == N - 1 or out.wall_h[i][j]
+            blocked[2][v] = j == 0 or out.wall_v[i][j-1]
+            blocked[3][v] = j == N - 1 or out.wall_v[i][j]
+    step = [-N, N, -1, 1]
+
+    pos = [i * N + j for i, j in input.ss]
+    used = bytearray(N * N)
+    for v in pos:
+        used[v] = 1
+    gs = [[] for _ in range(K)]
+    for i in range(K):
+        gs[out.group[i]].append(i)
+
+    # A group command keeps its robots in their lanes and in lane order, and a
+    # robot it cannot move (wall, or a robot that did not move either) stays
+    # stuck for the rest of a run of identical commands. So a run is sorted
+    # once and every repeat only processes the robots the previous one moved.
+    last = None
+    rs = ()
+    for op in out.out[:t]:
+        a, b, d = op
+        if a != 'g':
+            rs = (b,)
+        elif op != last:
+            # Only the order within a lane matters, and flat ids ascend along
+            # every column and row: ascending for U/L, descending for D/R
+            rs = sorted(gs[b], key=pos.__getitem__, reverse=d & 1 == 1)
+        last = op
+        blk = blocked[d]
+        delta = step[d]
+        moved = []
+        for r in rs:
+            v = pos[r]
+            if blk[v]:
+                continue
+            w = v + delta
+            if used[w]:
+                continue
+            pos[r] = w
+            used[v] = 0
+            used[w] = 1
+            moved.append(r)
+        rs = moved
+
+    final = [divmod(v, N) for v in pos]
+    score = t
+    for k in range(K):
+        score += abs(final[k][0] - input.ts[k][0]) * 100
+        score += abs(final[k][1] - input.ts[k][1]) * 100
+    return score, "", final
+
+
+def compute_score(input, out):
+    """(score, err) for a parsed output; score is 0 when err is non-empty"""
+    score, err, _ = compute_score_details(input, out)
+    if err:
+        score = 0
+    return score, err
+
+
+def score_text(input_text, output_text):
+    """Score raw input/output text like the vis tool: (score, err, final positions)"""
+    input = parse_input(input_text)
+    try:
+        out = parse_output(input, output_text)
+    except ValueError as e:
+        return 0, str(e), []
+    return compute_score_details(input, out)
+
+
+def main():
+    if len(sys.argv) != 3:
+        print(f"Usage: {sys.argv[0]} <input> <output>", file=sys.stderr)
+        return
+    with open(sys.argv[1]) as f:
+        input_text = f.read()
+    with open(sys.argv[2]) as f:
+        output_text = f.read()
+    score, err, _ = score_text(input_text, output_text)
+    if err:
+        print(err)
+        print("Score = 0")
+    else:
+        print(f"Score = {score}")
+
+
+if __name__ == "__main__":
+    main()
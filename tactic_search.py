@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Outer search over group move tactics
+Candidate tactics vary the phase order and the split of the first three
+directions; successive halving screens them with short SA runs and the
+survivor gets the rest of the budget, continuing from its own walls.
+"""
+
+import math
+import time
+
+from grouping import grouped_plan
+from phase_cache import is_grouped, split_tactic
+
+# Share of the time budget spent screening candidates
+SCREEN_FRACTION = 0.4
+
+OPPOSITE = {"U": "D", "D": "U", "L": "R", "R": "L"}
+
+SPLITS = (0.5, 1/3, 2/3)
+
+
+def tactic_candidates(opt):
+    """Distinct tactics for opt's displacement bounds, the fixed 7-phase one first;
+    multi-group plans for opt's current groups if opt.tactic is one"""
+    grouped = is_grouped(opt.tactic)
+    src = opt.src[:opt.K]
+    dst = opt.dst[:opt.K]
+    counts = {"U": opt.maxu, "L": opt.maxl, "D": opt.maxd, "R": opt.maxr}
+    orders = ["ULDR"]
+    for a in "UDLR":
+        for b in ("LR" if a in "UD" else "UD"):
+            order = a + b + OPPOSITE[a] + OPPOSITE[b]
+            if order not in orders:
+                orders.append(order)
+    candidates = []
+    for split in SPLITS:
+        for order in orders:
+            if grouped:
+                tactic = grouped_plan(src, dst, opt.group, opt.change, order, split)
+            else:
+                tactic = split_tactic(order, counts, split)
+            if tactic not in candidates:
+                candidates.append(tactic)
+    return candidates
+
+
+def search_tactics(opt, time_limit, count):
+    """Screen up to count candidate tactics and anneal the best one for the rest of time_limit.
+
+    Each halving round gives every survivor an equal share of the round's
+    budget, resuming from the walls it reached before. The best walls and
+    tactic seen are loaded into opt; returns (bv, total steps).
+    """
+    start = time.monotonic()
+    deadline = start + time_limit
+    screen_end = start + SCREEN_FRACTION * time_limit
+    pool = [(tactic, None) for tactic in tactic_candidates(opt)[:count]]
+    steps = 0
+    while len(pool) > 1:
+        rounds = math.ceil(math.log2(len(pool)))
+        share = max(0.0, screen_end - time.monotonic()) / rounds / len(pool)
+        results = []
+        for tactic, walls in pool:
+            bv, step = opt.run_sa(tactic, share, walls)
+            steps += step
+            results.append((bv, tactic, (opt.wallv.words[:], opt.wallh.words[:])))
+        results.sort(key=lambda res: res[0])
+        pool = [(tactic, walls) for _, tactic, walls in results[:(len(results) + 1) // 2]]
+
+    tactic, walls = pool[0]
+    _, step = opt.run_sa(tactic, max(0.0, deadline - time.monotonic()), walls)
+    steps += step
+    return opt.load_best(), steps
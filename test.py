@@ -1,32 +1,25 @@
-# Takes in the input file of /Users/skr3178/Downloads/tools/0000.txt
+# Takes in an input file (default in/0000.txt)
+import sys
 
-input_file = "/Users/skr3178/Downloads/tools/0000.txt"
+from instance_io import parse_instance
 
-with open(input_file, 'r') as file:
-    lines = file.readlines()
+input_file = sys.argv[1] if len(sys.argv) > 1 else "in/0000.txt"
 
-N = int(lines[0].split()[0])
-K = int(lines[0].split()[1])
+with open(input_file, 'rb') as file:
+    inst = parse_instance(file.read())
+
+N = inst.N
+K = inst.K
 
 # ss refers to the start coordinates of the robot(i0, j0)
 # ts refers to the end coordinates of the robot(i_k, j_k)
-ss = []
-ts = []
-for i in range(1, K+1):
-    ss.append((int(lines[i].split()[0]), int(lines[i].split()[1])))
-    ts.append((int(lines[i].split()[2]), int(lines[i].split()[3])))
-
-wall_v = []
-wall_h = []
+ss = inst.src
+ts = inst.dst
 
 # wall_v refers to the vertical walls
 # wall_h refers to the horizontal walls
-
-# get the vertical walls and the horizontal walls
-for i in range(1+K, 1+K+N):
-    wall_v.append(list(lines[i].strip()))
-for i in range(1+K+N, 1+K+2*N-1):
-    wall_h.append(list(lines[i].strip()))
+wall_v = [list(row) for row in inst.wall_strings()[0]]
+wall_h = [list(row) for row in inst.wall_strings()[1]]
 
 
 # as test case, we can use treat the entire as individual control
@@ -59,8 +52,8 @@ def get_next_position(x, y, direction):
 paths = []
 
 for i in range(K):
-    path = [(sx, sy)]
     sx, sy = ss[i]
+    path = [(sx, sy)]
     tx, ty = ts[i]
     while sx != tx or sy != ty: # direct path from start to end
         path.append((sx, sy))
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Corpus pack and memory-mapped load round trip
+Run with python3 -m pytest -q
+"""
+
+import shutil
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from corpus import Corpus, pack
+from instance_io import parse_instance
+
+SEEDS = (0, 2, 11, 99)
+
+
+def test_round_trip(tmp_path):
+    for seed in SEEDS:
+        shutil.copy(f"in/{seed:04d}.txt", tmp_path)
+    (tmp_path / "notes.txt").write_text("not an instance\n")
+    path = str(tmp_path / "corpus.bin")
+    assert pack(str(tmp_path), path) == len(SEEDS)
+    corpus = Corpus(path)
+    assert len(corpus) == len(SEEDS)
+    for seed in SEEDS:
+        with open(f"in/{seed:04d}.txt") as f:
+            text = f.read()
+        assert corpus.text(seed).split() == text.split()
+        inst = parse_instance(text)
+        K, src, dst, _, _ = corpus.views(seed)
+        assert K == inst.K
+        assert [tuple(p) for p in src.tolist()] == inst.src
+        assert [tuple(p) for p in dst.tolist()] == inst.dst
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "bogus.bin"
+    path.write_bytes(b"\0" * 256)
+    with pytest.raises(ValueError):
+        Corpus(str(path))
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Distance fields, the per-layout cache and occupancy-aware routing
+Run with python3 -m pytest -q
+"""
+
+from distance_cache import N, UNREACHABLE, DistanceFieldCache, descend, distance_field, grid_adjacency, route
+
+OPEN_V = ["0" * (N - 1)] * N
+OPEN_H = ["0" * N] * (N - 1)
+
+
+def walk(start, path):
+    for ch in path:
+        start += {"U": -N, "D": N, "L": -1, "R": 1}[ch]
+    return start
+
+
+def test_field_is_manhattan_on_an_open_grid():
+    adj = grid_adjacency(OPEN_V, OPEN_H)
+    field = distance_field(adj, 5 * N + 7)
+    assert all(field[v] == abs(v // N - 5) + abs(v % N - 7) for v in range(N * N))
+
+
+def test_walls_and_blocked_cells():
+    # A full vertical wall between columns 0 and 1 cuts column 0 off
+    adj = grid_adjacency([[1] + [0] * (N - 2)] * N, [[0] * N] * (N - 1))
+    field = distance_field(adj, 0)
+    assert field[1] == UNREACHABLE and field[N] == 1
+    assert distance_field(adj, 0, frozenset({0}))[N] == UNREACHABLE
+    assert distance_field(adj, 0, frozenset({N}))[2 * N] == UNREACHABLE
+
+
+def test_cache_hits_per_layout_and_target():
+    adj = grid_adjacency(OPEN_V, OPEN_H)
+    cache = DistanceFieldCache(capacity=2)
+    a = cache.field("A", adj, 0)
+    assert cache.field("A", adj, 0) is a
+    cache.field("B", adj, 0)
+    cache.field("A", adj, 1)
+    assert (cache.hits, cache.misses) == (1, 3)
+    # ("A", 0) was least recently used and is evicted
+    assert cache.field("A", adj, 0) is not a and cache.misses == 4
+
+
+def test_route_detours_around_robots():
+    adj = grid_adjacency(OPEN_V, OPEN_H)
+    cache = DistanceFieldCache()
+    start, target = 0, 3
+    assert route(cache, "A", adj, start, target, {start}) == "RRR"
+    # A robot on (0, 1) and (1, 1): the greedy descent fails, the fallback goes around
+    occupied = {start, 1, N + 1}
+    path = route(cache, "A", adj, start, target, occupied)
+    assert walk(start, path) == target and len(path) == 7
+    assert descend(adj, cache.field("A", adj, target), start, occupied) is None
+    # Boxed in by robots: no path at all
+    assert route(cache, "A", adj, start, target, {start, 1, N}) is None
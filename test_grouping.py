@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Displacement clustering, grouped plans and the single-group fallback
+Run with python3 -m pytest -q
+"""
+
+import pytest
+
+import pycho
+from grouping import cluster_displacements, group_counts, grouped_plan
+from phase_cache import split_tactic
+from pycho import MazeOptimizer
+
+INSTANCES = ("in/0000.txt", "in/0011.txt", "in/0019.txt")
+
+
+def load(path):
+    opt = MazeOptimizer()
+    with open(path, "rb") as f:
+        opt.read_input(f)
+    opt.prepare()
+    return opt
+
+
+def test_clusters_separate_opposite_displacements():
+    src = [(10, 10), (11, 10), (12, 10), (10, 20), (11, 20), (12, 20)]
+    dst = [(0, 10), (1, 10), (2, 10), (25, 20), (26, 20), (27, 20)]
+    assert cluster_displacements(src, dst, 2) == [0, 0, 0, 1, 1, 1]
+    assert cluster_displacements(src, dst, 1) == [0] * 6
+    # Identical displacements never yield more than one group
+    assert cluster_displacements(src[:3], [(s[0] - 5, s[1]) for s in src[:3]], 3) == [0, 0, 0]
+
+
+def test_grouped_plan_interleaves_each_groups_tactic():
+    src = [(10, 10), (10, 20)]
+    dst = [(0, 10), (25, 22)]
+    group = [0, 1]
+    plan = grouped_plan(src, dst, group, 0)
+    for g in (0, 1):
+        tactic = split_tactic("ULDR", group_counts(src, dst, group, g, 0))
+        assert [(d, n) for d, n, pg in plan if pg == g] == [(d, n) for d, n in tactic if n > 0]
+    # Phase p of every group before phase p+1 of any; empty phases are dropped
+    assert plan == [("U", 7, 1), ("L", 1, 1), ("D", 5, 0), ("D", 5, 0), ("L", 1, 1), ("U", 8, 1)]
+
+
+@pytest.mark.parametrize("path", INSTANCES)
+@pytest.mark.parametrize("count", (2, 4))
+def test_plan_groups_keeps_the_cheaper_plan(path, count):
+    opt = load(path)
+    single = opt.plan()
+    single_cost = opt.plan_cost(single)
+    opt.plan_groups(count)
+    assert opt.plan_cost(opt.plan()) <= single_cost
+    if not pycho.is_grouped(opt.tactic):
+        assert opt.plan() == single
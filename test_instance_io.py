@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Shared instance parser against a plain line-by-line reading
+Run with python3 -m pytest -q
+"""
+
+import io
+
+import pytest
+
+from instance_io import parse_instance, read_instance
+
+
+@pytest.mark.parametrize("path", ["in/0000.txt", "in/0002.txt", "in/0099.txt"])
+def test_matches_plain_parse(path):
+    with open(path) as f:
+        text = f.read()
+    lines = text.split("\n")
+    N, K = map(int, lines[0].split())
+    robots = [tuple(map(int, line.split())) for line in lines[1:1 + K]]
+    v_rows = lines[1 + K:1 + K + N]
+    h_rows = lines[1 + K + N:K + 2 * N]
+
+    inst = parse_instance(text)
+    assert (inst.N, inst.K) == (N, K)
+    assert inst.src == [r[:2] for r in robots]
+    assert inst.dst == [r[2:] for r in robots]
+    assert inst.wall_strings() == (v_rows, h_rows)
+    assert inst.wall_lists() == ([[ch == "1" for ch in row] for row in v_rows],
+                                 [[ch == "1" for ch in row] for row in h_rows])
+    for r in range(N):
+        for c in range(N + 1):
+            wall = c in (0, N) or v_rows[r][c - 1] == "1"
+            assert (inst.wall_v[r] >> c) & 1 == wall
+    for r in range(N + 1):
+        for c in range(N):
+            wall = r in (0, N) or h_rows[r - 1][c] == "1"
+            assert (inst.wall_h[r] >> c) & 1 == wall
+
+
+def test_streams_and_bytes_agree():
+    with open("in/0002.txt", "rb") as f:
+        data = f.read()
+    a = parse_instance(data)
+    b = read_instance(io.BytesIO(data))
+    c = read_instance(io.StringIO(data.decode()))
+    for other in (b, c):
+        assert (other.src, other.dst, other.wall_v, other.wall_h) == (a.src, a.dst, a.wall_v, a.wall_h)
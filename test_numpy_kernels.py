@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+NumPy sweeps against the python xfast kernels
+Single sweeps and batched flip scoring must reproduce the python backend
+position for position.
+Run with python3 -m pytest -q
+"""
+
+import pytest
+
+import pycho
+from pycho import MazeOptimizer
+
+pytest.importorskip("numpy")
+
+INSTANCES = ("in/0000.txt", "in/0001.txt", "in/0002.txt")
+
+
+def load(path, backend="python"):
+    """A prepared optimizer for path"""
+    opt = MazeOptimizer(backend=backend)
+    with open(path, "rb") as f:
+        opt.read_input(f)
+    opt.prepare()
+    return opt
+
+
+@pytest.mark.parametrize("path", INSTANCES)
+def test_sweeps_match_python(path):
+    opt = load(path)
+    ref = load(path, backend="numpy")
+    pycho.rng.init(2)
+    for type_op, r, c in opt.draw_flips(40):
+        opt.toggle_wall(type_op, r, c)
+        ref.toggle_wall(type_op, r, c)
+    ref.rebuild_all()
+    assert ref.run_tactic(ref.tactic) == opt.run_tactic(opt.tactic)
+    assert ref.sweeper.positions() == opt.pos[:opt.K]
+
+
+@pytest.mark.parametrize("path", INSTANCES)
+def test_batch_matches_python(path):
+    opt = load(path)
+    ref = load(path, backend="numpy")
+    pycho.rng.init(3)
+    flips = opt.draw_flips(32)
+    batch = ref.sweeper.run_tactic_batch(flips, ref.tactic).tolist()
+    for (type_op, r, c), av in zip(flips, batch):
+        opt.toggle_wall(type_op, r, c)
+        assert av == opt.run_tactic(opt.tactic)
+        opt.toggle_wall(type_op, r, c)
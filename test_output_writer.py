@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Buffered solution writer against plain per-line formatting
+Run with python3 -m pytest -q
+"""
+
+import io
+
+import pycho
+import scorer
+from output_writer import SolutionWriter
+from pycho import MazeOptimizer, N
+
+
+def test_matches_plain_formatting():
+    opt = MazeOptimizer()
+    with open("in/0002.txt", "rb") as f:
+        opt.read_input(f)
+    opt.prepare()
+    pycho.rng.init(1)
+    for type_op, r, c in opt.draw_flips(60):
+        opt.toggle_wall(type_op, r, c)
+    group = [i % 3 for i in range(opt.K)]
+    phases = [("U", 3), ("L", 0, 1), ("D", 2, 2)]
+
+    writer = SolutionWriter()
+    writer.walls(opt.wallv, opt.wallh)
+    writer.groups(group)
+    writer.tactic(0, phases)
+    writer.robot_moves(4, "")
+    writer.robot_moves(5, "RRD")
+
+    lines = ["".join("1" if opt.wallv.get(r, c + 1) else "0" for c in range(N - 1)) for r in range(N)]
+    lines += ["".join("1" if opt.wallh.get(r + 1, c) else "0" for c in range(N)) for r in range(N - 1)]
+    lines.append(" ".join(map(str, group)))
+    lines += ["g 0 U"] * 3 + ["g 2 D"] * 2 + ["i 5 R", "i 5 R", "i 5 D"]
+    expected = "\n".join(lines) + "\n"
+    assert writer.text() == expected
+    assert writer.ops == 8
+
+    out = io.StringIO()
+    writer.flush(out)
+    assert out.getvalue() == expected and writer.text() == ""
+    with open("in/0002.txt") as f:
+        assert scorer.score_text(f.read(), expected)[1] == ""
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Parameter table lookup and the tuning harness
+Run with python3 -m pytest -q
+"""
+
+import json
+import random
+
+import tune
+from param_table import SA_KEYS, SA_SETS, bucket_key, default_params, k_bucket, load_table, lookup
+
+
+def test_buckets():
+    assert [k_bucket(K) for K in (10, 32, 33, 55, 56, 100)] == ["K<33", "K<33", "K33-55", "K33-55", "K>55", "K>55"]
+    assert bucket_key(40, 3) == "K33-55/W3"
+
+
+def test_defaults_are_the_hand_tuned_sets():
+    for K in (10, 40, 80):
+        params = default_params(K)
+        assert params["ttype"] == (K > 55)
+        assert all(params[key] == value for key, value in SA_SETS[params["ttype"]].items())
+        assert set(SA_KEYS) <= set(params)
+
+
+def test_lookup_overrides_known_keys_of_its_bucket(tmp_path):
+    path = tmp_path / "params.json"
+    path.write_text(json.dumps({"buckets": {"K<33/W2": {"t0": 5.0, "bogus": 1}}}))
+    table = load_table(str(path))
+    assert lookup(table, 20, 2) == dict(default_params(20), t0=5.0)
+    assert lookup(table, 20, 3) == default_params(20)
+    assert load_table(str(tmp_path / "missing.json")) == {}
+
+
+def test_sampled_params_keep_the_keys():
+    gen = random.Random(1)
+    for K in (20, 80):
+        for _ in range(20):
+            assert set(tune.sample_params(K, gen, 0.5)) == set(default_params(K))
+
+
+def test_run_case_scores_a_full_run():
+    cand, path, score = tune.run_case((3, default_params(19), "in/0002.txt", 0.3))
+    assert (cand, path) == (3, "in/0002.txt")
+    assert 0 < score < tune.INVALID_SCORE
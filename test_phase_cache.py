@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Incremental phase-cache evaluation against full replays
+After any sequence of evaluated, committed and discarded wall flips the
+cached states, touch marks and score must equal those of a fresh replay.
+Run with python3 -m pytest -q
+"""
+
+import pytest
+
+import pycho
+from grouping import cluster_displacements, grouped_plan
+from phase_cache import PhaseCacheEvaluator
+from pycho import MazeOptimizer
+
+INSTANCES = ("in/0000.txt", "in/0001.txt", "in/0002.txt")
+
+
+def load(path, backend="python", groups=1):
+    """A prepared optimizer for path, optionally on a multi-group plan"""
+    opt = MazeOptimizer(backend=backend)
+    with open(path, "rb") as f:
+        opt.read_input(f)
+    opt.prepare()
+    if groups > 1:
+        src, dst = opt.src[:opt.K], opt.dst[:opt.K]
+        group = cluster_displacements(src, dst, groups)
+        opt.load_plan((group, grouped_plan(src, dst, group, opt.change)))
+    return opt
+
+
+@pytest.mark.parametrize("path", INSTANCES)
+@pytest.mark.parametrize("groups", (1, 3))
+def test_incremental_matches_full_replay(path, groups):
+    opt = load(path, groups=groups)
+    assert pycho.is_grouped(opt.tactic) == (groups > 1)
+    evaluator = PhaseCacheEvaluator(opt, opt.tactic)
+    pycho.rng.init(groups)
+    for i, (type_op, r, c) in enumerate(opt.draw_flips(300)):
+        opt.toggle_wall(type_op, r, c)
+        av = evaluator.evaluate(type_op, r, c)
+        if i % 3:
+            evaluator.commit()
+            assert av == evaluator.av
+        else:
+            opt.toggle_wall(type_op, r, c)
+            evaluator.discard()
+        if i % 50 == 49:
+            fresh = PhaseCacheEvaluator(opt, opt.tactic)
+            assert evaluator.av == fresh.av
+            assert evaluator.states == fresh.states
+            assert evaluator.wall_marks() == fresh.wall_marks()
+
+
+@pytest.mark.parametrize("path", INSTANCES)
+def test_incremental_matches_sweep(path):
+    opt = load(path)
+    evaluator = PhaseCacheEvaluator(opt, opt.tactic)
+    pycho.rng.init(1)
+    for type_op, r, c in opt.draw_flips(100):
+        opt.toggle_wall(type_op, r, c)
+        evaluator.evaluate(type_op, r, c)
+        evaluator.commit()
+    assert evaluator.av == opt.run_tactic(opt.tactic)
+    assert evaluator.final_positions() == opt.pos[:opt.K]
+
+
+@pytest.mark.parametrize("path", INSTANCES)
+def test_marks_index_the_touched_edges(path):
+    opt = load(path)
+    evaluator = PhaseCacheEvaluator(opt, opt.tactic)
+    markv, markh = evaluator.wall_marks()
+    pycho.rng.init(4)
+    for i, (type_op, r, c) in enumerate(opt.draw_flips(400)):
+        marked = (markv[r] >> (c+1)) & 1 if type_op == 0 else (markh[c] >> (r+1)) & 1
+        assert bool(marked) == (evaluator.first_affected(type_op, r, c) >= 0)
+        if i % 2:
+            opt.toggle_wall(type_op, r, c)
+            evaluator.evaluate(type_op, r, c)
+            evaluator.commit()
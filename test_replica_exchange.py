@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Replica exchange: shared parameters and rng, deadline and best walls
+Run with python3 -m pytest -q
+"""
+
+import time
+
+import pycho
+from param_table import default_params
+from phase_cache import PhaseCacheEvaluator
+from replica_exchange import Replica, anneal_tempering
+
+
+def load(path, params=None):
+    opt = pycho.MazeOptimizer(params=params)
+    with open(path, "rb") as f:
+        opt.read_input(f)
+    opt.prepare()
+    return opt
+
+
+def test_replicas_use_the_solvers_params_and_rng():
+    opt = load("in/0000.txt", dict(default_params(59), t0=3.0))
+    rep = Replica(pycho, opt.instance(), opt.plan(), opt.params)
+    assert rep.opt.params == opt.params
+    assert rep.rng is pycho.rng
+
+
+def test_tempering_keeps_the_deadline_and_loads_the_best_walls():
+    opt = load("in/0002.txt")
+    deadline = time.monotonic() + 0.2
+    bv, step, rates = anneal_tempering(opt, 3, deadline)
+    assert time.monotonic() - deadline < 0.05
+    assert step > 0 and len(rates) == 2
+    assert PhaseCacheEvaluator(opt, opt.tactic).av == bv
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+RNG against the reference Mersenne Twister
+Both block generators (pure python and numpy) must give the MT19937
+sequence, through rand(), next() and the raw reserve() buffer alike.
+Run with python3 -m pytest -q
+"""
+
+import random
+import sys
+
+import pytest
+
+from pycho import N, RNG
+
+
+def reference_words(seed, count):
+    """count tempered MT19937 outputs from the state RNG.init(seed) builds"""
+    mt = [seed]
+    for i in range(1, 624):
+        mt.append((1812433253 * (mt[-1] ^ (mt[-1] >> 30)) + i) & 0xFFFFFFFF)
+    gen = random.Random()
+    gen.setstate((3, tuple(mt) + (624,), None))
+    return [gen.getrandbits(32) for _ in range(count)]
+
+
+@pytest.mark.parametrize("vectorized", (False, True))
+def test_matches_reference(vectorized, monkeypatch):
+    if vectorized:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.delitem(sys.modules, "numpy", raising=False)
+    rng = RNG(5489)
+    words = reference_words(5489, 1500)
+    # First output of std::mt19937 with its default seed
+    assert words[0] == 3499211612
+    assert [rng.rand() for _ in range(700)] == words[:700]
+    buf, i = rng.reserve(800)
+    assert buf[i:i+800] == words[700:1500]
+    rng.index = i + 800
+    rng.init(5489)
+    assert [rng.next(N) for _ in range(100)] == [(w * N) >> 32 for w in words[:100]]
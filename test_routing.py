@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Cleanup routing: route_robot and the find_path fallback
+Run with python3 -m pytest -q
+"""
+
+import pytest
+
+from pycho import MazeOptimizer, N
+
+
+def load(path):
+    opt = MazeOptimizer()
+    with open(path, "rb") as f:
+        opt.read_input(f)
+    opt.prepare()
+    opt.build_bfs_graph()
+    opt.reset()
+    return opt
+
+
+def place(opt, i, p):
+    """Move robot i to cell p, keeping the occupancy board in sync"""
+    opt.cell.clear(*opt.pos[i])
+    opt.pos[i] = p
+    opt.cell.set(*p)
+
+
+def fallback_cell(opt, p0, p1):
+    """The documented fallback: min 100 * |v - p1| - dist(p0, v), ties to the highest id"""
+    occupied = {y*N + x for y, x in opt.pos[:opt.K]}
+    s = p0[0]*N + p0[1]
+    dist = {s: 0}
+    queue = [s]
+    for v in queue:
+        for nid, _ in opt.route_adj[v]:
+            if nid not in dist and nid not in occupied:
+                dist[nid] = dist[v] + 1
+                queue.append(nid)
+    return max(dist, key=lambda v: (-(abs(v // N - p1[0]) + abs(v % N - p1[1])) * 100 + dist[v], v))
+
+
+@pytest.mark.parametrize("path", ["in/0000.txt", "in/0002.txt"])
+def test_route_reaches_free_destinations(path):
+    opt = load(path)
+    for i in range(opt.K):
+        if opt.pos[i] != opt.dst[i] and not opt.cell.get(*opt.dst[i]):
+            route = opt.route_robot(i)
+            opt.imovepath(route, i)
+            assert opt.pos[i] == opt.dst[i]
+
+
+def test_fallback_stops_at_the_best_reachable_cell():
+    opt = load("in/0002.txt")
+    # Box robot 0's destination in with the next robots
+    ty, tx = opt.dst[0]
+    boxes = [(ty + dy, tx + dx) for dy, dx in ((-1, 0), (1, 0), (0, -1), (0, 1))
+             if 0 <= ty + dy < N and 0 <= tx + dx < N]
+    movers = [i for i in range(1, opt.K) if opt.pos[i] not in boxes]
+    for p in boxes:
+        if not opt.cell.get(*p):
+            place(opt, movers.pop(), p)
+    p0 = opt.pos[0]
+    assert p0 not in boxes
+    expected = divmod(fallback_cell(opt, p0, opt.dst[0]), N)
+    route = opt.route_robot(0)
+    assert route == opt.find_path(p0, opt.dst[0])
+    opt.imovepath(route, 0)
+    assert opt.pos[0] == expected != opt.dst[0]
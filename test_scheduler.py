@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Scheduler budget arithmetic on a fake clock
+Run with python3 -m pytest -q
+"""
+
+import pytest
+
+import scheduler
+from scheduler import COST_FACTOR, EXIT_MARGIN, PHASE_COSTS, Scheduler
+
+
+class Clock:
+    def __init__(self, now=100.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(scheduler.time, "monotonic", clock)
+    return clock
+
+
+def test_budget_leaves_margin_and_phases(clock):
+    sched = Scheduler(limit=2.0, margin=0.08, start=clock.now - 0.5)
+    K = 50
+    reserve = sum(PHASE_COSTS[name][0] + PHASE_COSTS[name][1] * K for name in PHASE_COSTS)
+    assert sched.reserve(K) == pytest.approx(reserve)
+    assert sched.remaining() == pytest.approx(2.0 - 0.08 - 0.5)
+    assert sched.hard_remaining() == pytest.approx(2.0 - EXIT_MARGIN - 0.5)
+    assert sched.anneal_budget(K) == pytest.approx(2.0 - 0.08 - 0.5 - reserve)
+    clock.now += 2.0
+    assert sched.anneal_budget(K) == 0.0
+
+
+def test_small_margin_never_overlaps_hard_stop(clock):
+    for margin in (0.0, EXIT_MARGIN / 2, EXIT_MARGIN):
+        sched = Scheduler(limit=0.5, margin=margin, start=clock.now)
+        assert sched.remaining() == pytest.approx(sched.hard_remaining())
+        # Annealing for its whole budget still leaves every later phase its reserve
+        clock.now += sched.anneal_budget(10)
+        assert sched.hard_remaining() == pytest.approx(sched.reserve(10))
+        clock.now = 100.0
+
+
+def test_measured_cost_replaces_estimate(clock):
+    sched = Scheduler(start=clock.now)
+    sched.measured("bfs", 0.01, 0.001)
+    assert sched.costs["bfs"] == (COST_FACTOR * 0.01, COST_FACTOR * 0.001)
+    assert sched.reserve(20, phases=("bfs",)) == pytest.approx(COST_FACTOR * (0.01 + 0.02))
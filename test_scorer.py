@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+scorer.py against a plain port of the tools' compute_score (src/lib.rs)
+Run with python3 -m pytest -q
+"""
+
+import random
+
+import pytest
+
+import scorer
+
+DIJ = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+
+def reference_score(input, out):
+    """compute_score_details of src/lib.rs, line for line: (score, final positions)"""
+    N = input.N
+    pos = list(input.ss)
+    used = [[False] * N for _ in range(N)]
+    for x, y in pos:
+        used[x][y] = True
+    gs = [[] for _ in range(input.K)]
+    for i in range(input.K):
+        gs[out.group[i]].append(i)
+    for a, b, d in out.out:
+        rs = list(gs[b]) if a == 'g' else [b]
+        di, dj = DIJ[d]
+        rs.sort(key=lambda i: -(pos[i][0] * di + pos[i][1] * dj))
+        for r in rs:
+            x, y = pos[r]
+            x2, y2 = x + di, y + dj
+            if not (0 <= x2 < N and 0 <= y2 < N) or used[x2][y2]:
+                continue
+            if di == 0:
+                if out.wall_v[x][min(y, y2)]:
+                    continue
+            elif out.wall_h[min(x, x2)][y]:
+                continue
+            pos[r] = (x2, y2)
+            used[x][y] = False
+            used[x2][y2] = True
+    score = len(out.out)
+    for (x, y), (tx, ty) in zip(pos, input.ts):
+        score += (abs(x - tx) + abs(y - ty)) * 100
+    return score, pos
+
+
+def random_output(text, gen):
+    """Random legal output for an instance: walls, a few groups and runs of commands"""
+    N = 30
+    K = int(text.split()[1])
+    lines = ["".join(gen.choice("0000001") for _ in range(N - 1)) for _ in range(N)]
+    lines += ["".join(gen.choice("0000001") for _ in range(N)) for _ in range(N - 1)]
+    groups = gen.randint(1, 4)
+    lines.append(" ".join(str(gen.randrange(groups)) for _ in range(K)))
+    while len(lines) < 2 * N + 400:
+        d = gen.choice("UDLR")
+        if gen.random() < 0.7:
+            lines += [f"g {gen.randrange(groups)} {d}"] * gen.randint(1, 30)
+        else:
+            lines.append(f"i {gen.randrange(K)} {d}")
+    return "\n".join(lines) + "\n"
+
+
+@pytest.mark.parametrize("path", ["in/0000.txt", "in/0002.txt", "in/0011.txt"])
+def test_matches_reference(path):
+    with open(path) as f:
+        text = f.read()
+    input = scorer.parse_input(text)
+    gen = random.Random(path)
+    for _ in range(20):
+        out = scorer.parse_output(input, random_output(text, gen))
+        score, err, final = scorer.compute_score_details(input, out)
+        assert not err
+        assert (score, final) == reference_score(input, out)
+
+
+def test_prefix_and_errors():
+    with open("in/0002.txt") as f:
+        text = f.read()
+    input = scorer.parse_input(text)
+    body = random_output(text, random.Random(1))
+    out = scorer.parse_output(input, body)
+    for t in (0, 1, 17, 200):
+        prefix = scorer.Output(out.wall_v, out.wall_h, out.group, out.out[:t])
+        assert scorer.compute_score_details(input, out, t)[0] == reference_score(input, prefix)[0]
+    assert scorer.score_text(text, body + "g 0 X\n")[1] == "Invalid direction: X"
+    assert scorer.score_text(text, body + "g 0\n")[1] == "Unexpected EOF"
+    assert scorer.score_text(text, "")[:2] == (0, "Unexpected EOF")
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Zobrist wall hashes and the transposition table
+Run with python3 -m pytest -q
+"""
+
+import pycho
+from pycho import MazeOptimizer
+from transposition import TranspositionTable, wall_hash
+
+
+def test_incremental_hash_matches_full_hash():
+    opt = MazeOptimizer()
+    with open("in/0000.txt", "rb") as f:
+        opt.read_input(f)
+    opt.prepare()
+    start = opt.zhash
+    pycho.rng.init(1)
+    flips = opt.draw_flips(200)
+    for type_op, r, c in flips:
+        opt.toggle_wall(type_op, r, c)
+        assert opt.zhash == wall_hash(opt.wallv.words, opt.wallh.words)
+    for type_op, r, c in reversed(flips):
+        opt.toggle_wall(type_op, r, c)
+    assert opt.zhash == start
+    opt.rebuild_all()
+    assert opt.zhash == start
+
+
+def test_table_is_an_lru_with_counters():
+    table = TranspositionTable(capacity=2)
+    assert table.get(1) is None
+    table.put(1, 10)
+    table.put(2, 20)
+    assert table.get(1) == 10
+    table.put(3, 30)
+    # 2 was least recently used
+    assert table.get(2) is None and table.get(3) == 30 and table.get(1) == 10
+    assert (table.hits, table.misses) == (3, 2)
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Transposition cache for annealed wall layouts
+Every wall edge gets a fixed 64-bit Zobrist key, so the hash of a layout is
+the XOR of the keys of its walls and one toggle updates it with one XOR.
+TranspositionTable maps layout hashes to scores, letting the annealer skip
+the simulation when a proposal leads back to a layout it already scored.
+"""
+
+import random
+from collections import OrderedDict
+
+N = 30
+
+ZOBRIST_SEED = 0x5EED
+
+
+def zobrist_keys(seed=ZOBRIST_SEED):
+    """(keys_v, keys_h): 64-bit keys of the SA flips (0, r, c) and (1, r, c) at r*N + c"""
+    gen = random.Random(seed)
+    keys_v = [gen.getrandbits(64) for _ in range(N * N)]
+    keys_h = [gen.getrandbits(64) for _ in range(N * N)]
+    return keys_v, keys_h
+
+
+ZOBRIST_V, ZOBRIST_H = zobrist_keys()
+
+
+def wall_hash(wallv_words, wallh_words):
+    """Zobrist hash of the inner walls of pycho wallv/wallh bitboard words"""
+    h = 0
+    for r in range(N):
+        for c in range(N - 1):
+            if (wallv_words[r] >> (c + 1)) & 1:
+                h ^= ZOBRIST_V[r*N + c]
+    for c in range(N):
+        for r in range(N - 1):
+            if (wallh_words[c] >> (r + 1)) & 1:
+                h ^= ZOBRIST_H[r*N + c]
+    return h
+
+
+class TranspositionTable:
+    """LRU map from layout hash to score, valid for one tactic"""
+    def __init__(self, capacity=1 << 16):
+        self.capacity = capacity
+        self.scores = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Cached score of key, or None"""
+        av = self.scores.get(key)
+        if av is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.scores.move_to_end(key)
+        return av
+
+    def put(self, key, av):
+        self.scores[key] = av
+        if len(self.scores) > self.capacity:
+            self.scores.popitem(last=False)
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Parallel parameter tuning per instance bucket
+Instances from in/ are grouped by K bucket and wall count W. For every
+bucket, candidates (the current parameters plus random perturbations of the
+annealing set, the temperature type and the tactic offset) go through
+successive halving: each round runs the survivors on twice as many of the
+bucket's instances and keeps the better half by mean log score. Runs are
+whole pycho solves executed in-process in a worker pool and scored with
+scorer.score_text. The winner of every bucket is written to the parameter
+table pycho loads at startup (param_table.PARAM_TABLE by default).
+
+Usage: python3 tune.py [--in=in] [--out=params.json] [--workers=1]
+           [--candidates=16] [--time=0.5] [--start=2] [--per-bucket=8]
+           [--buckets=K<33/W0,...] [--spread=0.5] [--seed=1]
+"""
+
+import contextlib
+import io
+import json
+import math
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+import pycho
+import scorer
+from param_table import PARAM_TABLE, SA_SETS, bucket_key, default_params
+from scheduler import Scheduler
+
+# Score assigned to invalid or timed-out runs, worse than any real score
+INVALID_SCORE = 10**9
+
+_texts = {}
+
+
+def load_buckets(in_dir, per_bucket):
+    """{bucket key: [(path, K)]} with at most per_bucket instances each, in file order"""
+    buckets = {}
+    for name in sorted(os.listdir(in_dir)):
+        if not (name.endswith(".txt") and name[:-4].isdigit()):
+            continue
+        opt = pycho.MazeOptimizer()
+        with open(os.path.join(in_dir, name), "rb") as f:
+            opt.read_input(f)
+        opt.prepare()
+        group = buckets.setdefault(bucket_key(opt.K, opt.W), [])
+        if len(group) < per_bucket:
+            group.append((os.path.join(in_dir, name), opt.K))
+    return dict(sorted(buckets.items()))
+
+
+def sample_params(K, gen, spread):
+    """The defaults for K, or with probability 1/4 the other annealing set, perturbed log-uniformly"""
+    params = default_params(K)
+    if gen.random() < 0.25:
+        params["ttype"] = not params["ttype"]
+        params.update(SA_SETS[params["ttype"]])
+    for key in ("t0", "tn", "tempo", "removed_factor"):
+        params[key] *= math.exp(gen.uniform(-spread, spread))
+    params["change"] += gen.choice((-1, 0, 0, 1))
+    return params
+
+
+def run_case(args):
+    """Solve one instance in-process with fixed params; returns (candidate, path, score).
+
+    Runs whose BFS cleanup hit the hard stop score as INVALID_SCORE: their
+    truncated output measures the clock, not the parameters.
+    """
+    cand, params, path, seconds = args
+    if path not in _texts:
+        with open(path) as f:
+            _texts[path] = f.read()
+    text = _texts[path]
+    pycho.rng.init(1)
+    opt = pycho.MazeOptimizer(params=params)
+    out = io.StringIO()
+    log = io.StringIO()
+    sched = Scheduler(limit=seconds, start=time.monotonic())
+    with contextlib.redirect_stderr(log):
+        opt.solve(io.BytesIO(text.encode()), out, sched)
+    if "[DATA] bfs_timeout = 1" in log.getvalue():
+        return cand, path, INVALID_SCORE
+    score, err, _ = scorer.score_text(text, out.getvalue())
+    return cand, path, score if not err else INVALID_SCORE
+
+
+def halve(pool, candidates, cases, start, seconds):
+    """Successive halving over candidates on cases [(path, K)]; returns (winner, {cand: mean log score}).
+
+    Candidate 0 (the current parameters) is kept as a reference in every round,
+    so its mean over the final cases is always available.
+    """
+    scores = {cand: {} for cand in range(len(candidates))}
+    alive = list(range(len(candidates)))
+    count = min(start, len(cases))
+    while True:
+        jobs = [(cand, candidates[cand], path, seconds)
+                for cand in alive for path, _ in cases[:count] if path not in scores[cand]]
+        for cand, path, score in pool.imap_unordered(run_case, jobs):
+            scores[cand][path] = score
+        mean = {cand: sum(math.log(s) for s in scores[cand].values()) / len(scores[cand]) for cand in alive}
+        alive.sort(key=lambda cand: mean[cand])
+        if len(alive) == 1 or count == len(cases):
+            return alive[0], mean
+        alive = alive[:(len(alive) + 1) // 2]
+        if 0 not in alive:
+            alive.append(0)
+        count = min(2 * count, len(cases))
+
+
+def main():
+    in_dir = "in"
+    out_path = PARAM_TABLE
+    workers = 1
+    count = 16
+    seconds = 0.5
+    start = 2
+    per_bucket = 8
+    only = None
+    spread = 0.5
+    seed = 1
+    for arg in sys.argv[1:]:
+        key, _, value = arg.partition("=")
+        if key == "--in":
+            in_dir = value
+        elif key == "--out":
+            out_path = value
+        elif key == "--workers":
+            workers = int(value)
+        elif key == "--candidates":
+            count = int(value)
+        elif key == "--time":
+            seconds = float(value)
+        elif key == "--start":
+            start = int(value)
+        elif key == "--per-bucket":
+            per_bucket = int(value)
+        elif key == "--buckets":
+            only = value.split(",")
+        elif key == "--spread":
+            spread = float(value)
+        elif key == "--seed":
+            seed = int(value)
+        else:
+            print(__doc__.split("Usage: ")[1], file=sys.stderr)
+            sys.exit(2)
+
+    buckets = load_buckets(in_dir, per_bucket)
+    if only is not None:
+        buckets = {key: cases for key, cases in buckets.items() if key in only}
+    gen = random.Random(seed)
+    table = {"time": seconds, "buckets": {}, "stats": {}}
+    with multiprocessing.Pool(workers) as pool:
+        for key, cases in buckets.items():
+            K = cases[0][1]
+            # Candidate 0 is the current parameter set, so a bucket never gets worse on its sample
+            candidates = [default_params(K)] + [sample_params(K, gen, spread) for _ in range(count - 1)]
+            t = time.time()
+            winner, mean = halve(pool, candidates, cases, start, seconds)
+            table["buckets"][key] = candidates[winner]
+            table["stats"][key] = {
+                "instances": len(cases),
+                "default": round(math.exp(mean[0]), 1),
+                "best": round(math.exp(mean[winner]), 1),
+            }
+            print(f"{key:12s} n={len(cases):2d} default={table['stats'][key]['default']} "
+                  f"best={table['stats'][key]['best']} ({time.time() - t:.1f}s) {candidates[winner]}",
+                  file=sys.stderr)
+
+    with open(out_path, "w") as f:
+        json.dump(table, f, indent=1)
+    print(f"wrote {len(table['buckets'])} buckets to {out_path}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()